@@ -1,24 +1,31 @@
 #!/usr/bin/env python3
 """Apply guide translations batch 1: de, es, fr, pt, ja, ko, ar, fa, he, hi, id, ms, th"""
-import json, os, sys
+import os, sys
 sys.path.insert(0, os.path.expanduser("~/Developer/dopplerLanding"))
+from tools import telemetry
+from tools.atomic import CatalogTransaction
+from tools.jsonpatch import apply_patch, diff
 
-MESSAGES_DIR = os.path.expanduser("~/Developer/dopplerLanding/messages")
+MESSAGES_DIR = os.environ.get("MESSAGES_DIR") or os.path.expanduser("~/Developer/dopplerLanding/messages")
 
-# Import translations from translate_guides.py
-exec(open(os.path.expanduser("~/Developer/dopplerLanding/translate_guides.py")).read())
+# Import translations from translate_guides.py. It runs in its own namespace:
+# the script sets MESSAGES_DIR itself, which would otherwise override
+# $MESSAGES_DIR (e.g. the scratch copy `tools.goldens check --run` passes).
+_guides = {}
+exec(open(os.path.expanduser("~/Developer/dopplerLanding/translate_guides.py")).read(), _guides)
+translations = _guides["translations"]
 
-for lang, guide_data in translations.items():
-    filepath = os.path.join(MESSAGES_DIR, f"{lang}.json")
-    if not os.path.exists(filepath):
-        print(f"SKIP: {filepath}")
-        continue
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    data["guide"] = guide_data
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
-    print(f"OK: {lang}")
+with telemetry.run("apply_batch1"), CatalogTransaction(MESSAGES_DIR) as txn:
+    for lang, guide_data in translations.items():
+        filepath = os.path.join(MESSAGES_DIR, f"{lang}.json")
+        if not os.path.exists(filepath):
+            print(f"SKIP: {filepath}")
+            continue
+        with telemetry.span("apply", locale=lang):
+            data = txn.load(lang)
+            ops = diff(data, dict(data, guide=guide_data))
+            txn.stage(lang, apply_patch(data, ops, in_place=True))
+            telemetry.inc("keys_changed_total", len(ops), locale=lang)
+            print(f"OK: {lang} ({len(ops)} changes)")
 
 print("Done batch 1")
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 """Apply guide translations to all language files."""
-import json
 import os
 import copy
 
-MESSAGES_DIR = os.path.expanduser("~/Developer/dopplerLanding/messages")
+from tools import telemetry
+from tools.atomic import CatalogTransaction
+from tools.jsonpatch import apply_patch, diff
+
+MESSAGES_DIR = os.environ.get("MESSAGES_DIR") or os.path.expanduser("~/Developer/dopplerLanding/messages")
 
 def deep_update(base, updates):
     """Recursively update base dict with updates dict."""
@@ -475,22 +478,21 @@ translations["ur"] = {
 # First, load the translations from translate_guides.py (the ones that were written there)
 # Actually, let me just include all remaining languages here too
 
-# Load and apply
-for lang, guide_data in translations.items():
-    filepath = os.path.join(MESSAGES_DIR, f"{lang}.json")
-    if not os.path.exists(filepath):
-        print(f"SKIP: {filepath} does not exist")
-        continue
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    data["guide"] = guide_data
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
-    
-    print(f"OK: {lang}")
+# Load and apply -- every file is staged first and renamed into place together,
+# so a failure in one language leaves all catalogs untouched.
+with telemetry.run("apply_translations"), CatalogTransaction(MESSAGES_DIR) as txn:
+    for lang, guide_data in translations.items():
+        filepath = os.path.join(MESSAGES_DIR, f"{lang}.json")
+        if not os.path.exists(filepath):
+            print(f"SKIP: {filepath} does not exist")
+            continue
+
+        with telemetry.span("apply", locale=lang):
+            data = txn.load(lang)
+            ops = diff(data, dict(data, guide=guide_data))
+            txn.stage(lang, apply_patch(data, ops, in_place=True))
+
+            telemetry.inc("keys_changed_total", len(ops), locale=lang)
+            print(f"OK: {lang} ({len(ops)} changes)")
 
 print("Done with batch 2 (tr, vi, sw, tl, ur)")
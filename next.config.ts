@@ -1,8 +1,13 @@
+import { existsSync } from "node:fs";
 import type { NextConfig } from "next";
 import createNextIntlPlugin from "next-intl/plugin";
 
 const withNextIntl = createNextIntlPlugin("./src/i18n/request.ts");
 
+// Written by `python -m tools.sitemap` (prebuild). When it is missing, the
+// single sitemap from src/app/sitemap.ts stays at /sitemap.xml.
+const hasShardedSitemap = existsSync("public/sitemaps/sitemap.xml");
+
 const nextConfig: NextConfig = {
   experimental: {
     optimizePackageImports: ["next-intl"],
@@ -24,6 +29,15 @@ const nextConfig: NextConfig = {
         destination: "/:locale/downloads",
         permanent: true,
       },
+      ...(hasShardedSitemap
+        ? [
+            {
+              source: "/sitemap.xml",
+              destination: "/sitemaps/sitemap.xml",
+              permanent: false,
+            },
+          ]
+        : []),
     ];
   },
   images: {
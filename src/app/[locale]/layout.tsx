@@ -13,6 +13,7 @@ import {
 import { Analytics } from "@vercel/analytics/react";
 import { CookieConsent } from "@/components/cookie-consent";
 import { ThemeProvider } from "@/components/theme-provider";
+import { rasterSubset } from "@/lib/font-subsets";
 import "@/app/globals.css";
 
 // Instrument Serif - for hero headline only
@@ -48,11 +49,14 @@ const jost = Jost({
   weight: ["400", "500", "600", "700"],
 });
 
-// FK Raster - for "Stay protected" text only
+// FK Raster - for "Stay protected" text only. Locales with a subset from
+// tools/font_subset.py load that instead; the full font stays as the fallback
+// for characters outside the subset, so it is not preloaded.
 const fkRaster = localFont({
   src: "../../fonts/FKRasterRomanCompact-Blended.otf",
   variable: "--font-raster",
   display: "swap",
+  preload: false,
 });
 
 export function generateStaticParams() {
@@ -148,6 +152,7 @@ export default async function LocaleLayout({
 
   const messages = await getMessages();
   const dir = isRtlLocale(locale) ? "rtl" : "ltr";
+  const raster = rasterSubset(locale);
 
   return (
     <html
@@ -158,8 +163,18 @@ export default async function LocaleLayout({
         ? `${jost.variable} ${inter.variable} ${fkRaster.variable}`
         : `${instrumentSerif.variable} ${spaceGrotesk.variable} ${fkRaster.variable}`
       }
+      style={raster
+        ? ({ "--font-raster": `"FK Raster Subset", ${fkRaster.style.fontFamily}` } as React.CSSProperties)
+        : undefined
+      }
     >
       <head>
+        {raster && (
+          <>
+            <link rel="preload" href={raster.file} as="font" type="font/woff2" crossOrigin="anonymous" />
+            <style>{`@font-face{font-family:"FK Raster Subset";src:url(${raster.file}) format("woff2");font-display:swap;unicode-range:${raster.unicodeRange}}`}</style>
+          </>
+        )}
         <OrganizationSchema locale={locale} />
         <ProductSchema locale={locale} />
         <WebsiteSchema locale={locale} />
@@ -1,5 +1,13 @@
+import { existsSync } from "node:fs";
+import path from "node:path";
 import type { MetadataRoute } from "next";
 
+// The sharded index from `python -m tools.sitemap` (prebuild) when it was
+// generated, else the single sitemap from src/app/sitemap.ts.
+const SITEMAP = existsSync(path.join(process.cwd(), "public", "sitemaps", "sitemap.xml"))
+  ? "https://www.dopplervpn.org/sitemaps/sitemap.xml"
+  : "https://www.dopplervpn.org/sitemap.xml";
+
 export default function robots(): MetadataRoute.Robots {
   return {
     rules: [
@@ -9,6 +17,6 @@ export default function robots(): MetadataRoute.Robots {
         disallow: ["/admin-dvpn", "/api/admin"],
       },
     ],
-    sitemap: "https://www.dopplervpn.org/sitemap.xml",
+    sitemap: SITEMAP,
   };
 }
@@ -11,6 +11,20 @@ export default getRequestConfig(async ({ requestLocale }) => {
 
   return {
     locale,
-    messages: (await import(`../../messages/${locale}.json`)).default,
+    messages: await loadMessages(locale),
   };
 });
+
+// Production builds serve the bundle from `python -m tools.icu` (prebuild),
+// with keys the locale lacks filled from en. Dev reads messages/ directly so
+// catalog edits hot-reload, and so does any build where the bundle is missing.
+async function loadMessages(locale: string) {
+  if (process.env.NODE_ENV !== "development") {
+    try {
+      return (await import(`./compiled/${locale}.json`)).default;
+    } catch {
+      // Not compiled; fall through to the source catalog.
+    }
+  }
+  return (await import(`../../messages/${locale}.json`)).default;
+}
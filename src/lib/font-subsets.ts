@@ -0,0 +1,26 @@
+import "server-only";
+import { readFileSync } from "node:fs";
+import path from "node:path";
+
+export interface FontSubset {
+  file: string;
+  bytes: number;
+  unicodeRange: string;
+}
+
+// Written by `python -m tools.font_subset` (prebuild). Missing in dev and on
+// checkouts where the subsetter has not run; callers fall back to the full font.
+const MANIFEST_PATH = path.join(process.cwd(), "public", "fonts", "subsets", "manifest.json");
+
+let manifest: Record<string, FontSubset> | null | undefined;
+
+export function rasterSubset(locale: string): FontSubset | null {
+  if (manifest === undefined) {
+    try {
+      manifest = JSON.parse(readFileSync(MANIFEST_PATH, "utf8"));
+    } catch {
+      manifest = null;
+    }
+  }
+  return manifest?.[locale] ?? null;
+}
@@ -0,0 +1,44 @@
+-- =====================================================
+-- ADMIN DASHBOARD SOURCE TABLES
+-- accounts, telegram_links, device_sessions and bot_messages_log are
+-- owned by the VPN backend and the Telegram bot, not by this repo. This
+-- file records only the columns /api/admin/dashboard and
+-- tools/dashboard_rollup.py read, so a database set up from schema.sql can run
+-- migrations/003_dashboard_aggregates.sql and the rollup locally.
+-- Run this AFTER schema.sql and BEFORE migrations/003.
+-- Safe, idempotent: never alters an existing table
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS accounts (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  account_code TEXT,
+  subscription_tier TEXT DEFAULT 'free',
+  subscription_expires_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS telegram_links (
+  telegram_id BIGINT PRIMARY KEY,
+  account_id UUID REFERENCES accounts(id) ON DELETE SET NULL,
+  username TEXT,
+  first_name TEXT,
+  bot_source TEXT,
+  is_channel_member BOOLEAN DEFAULT FALSE,
+  total_messages INTEGER DEFAULT 0,
+  last_active_at TIMESTAMPTZ
+);
+
+CREATE TABLE IF NOT EXISTS device_sessions (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  account_id UUID REFERENCES accounts(id) ON DELETE CASCADE,
+  device_type TEXT,
+  created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS bot_messages_log (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  telegram_user_id BIGINT NOT NULL,
+  content TEXT,
+  template_key TEXT,
+  created_at TIMESTAMPTZ DEFAULT NOW()
+);
@@ -0,0 +1,48 @@
+-- =====================================================
+-- ADMIN DASHBOARD AGGREGATES
+-- Maintained by `python -m tools.dashboard_rollup`; read by
+-- /api/admin/dashboard as a single row.
+-- Needs accounts, telegram_links and device_sessions: on a database set
+-- up from schema.sql, run supabase/dashboard-source-tables.sql first.
+-- Safe, idempotent, non-destructive
+-- =====================================================
+
+-- Signups per hour (accounts.created_at)
+CREATE TABLE IF NOT EXISTS dashboard_signup_buckets (
+  bucket_start TIMESTAMPTZ PRIMARY KEY,
+  signups BIGINT NOT NULL DEFAULT 0
+);
+
+-- Watermark per source column ('accounts.created_at')
+CREATE TABLE IF NOT EXISTS dashboard_rollup_state (
+  source TEXT PRIMARY KEY,
+  watermark TIMESTAMPTZ,
+  refreshed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- The row the dashboard reads
+CREATE TABLE IF NOT EXISTS dashboard_summary (
+  id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+  accounts_total BIGINT NOT NULL DEFAULT 0,
+  accounts_today BIGINT NOT NULL DEFAULT 0,
+  accounts_week BIGINT NOT NULL DEFAULT 0,
+  accounts_month BIGINT NOT NULL DEFAULT 0,
+  tier_breakdown JSONB NOT NULL DEFAULT '{}',
+  active_subscriptions BIGINT NOT NULL DEFAULT 0,
+  telegram_total BIGINT NOT NULL DEFAULT 0,
+  telegram_by_source JSONB NOT NULL DEFAULT '{}',
+  channel_members BIGINT NOT NULL DEFAULT 0,
+  active_users_24h BIGINT NOT NULL DEFAULT 0,
+  total_messages BIGINT NOT NULL DEFAULT 0,
+  devices_total BIGINT NOT NULL DEFAULT 0,
+  devices_by_type JSONB NOT NULL DEFAULT '{}',
+  refreshed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Watermark and signup bucket scans
+CREATE INDEX IF NOT EXISTS idx_accounts_created_at ON accounts(created_at);
+
+-- Service role only (the admin API uses it; RLS blocks everyone else)
+ALTER TABLE dashboard_signup_buckets ENABLE ROW LEVEL SECURITY;
+ALTER TABLE dashboard_rollup_state ENABLE ROW LEVEL SECURITY;
+ALTER TABLE dashboard_summary ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,14 @@
+-- =====================================================
+-- ROLLBACK: Remove dashboard aggregate tables
+-- Safe: Only drops rollup objects, never source data
+-- =====================================================
+
+BEGIN;
+
+DROP TABLE IF EXISTS dashboard_summary;
+DROP TABLE IF EXISTS dashboard_rollup_state;
+DROP TABLE IF EXISTS dashboard_signup_buckets;
+
+DROP INDEX IF EXISTS idx_accounts_created_at;
+
+COMMIT;
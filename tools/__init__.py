@@ -0,0 +1,4 @@
+"""Python tooling for the messages/ catalogs, the blog corpus and the Supabase backend.
+
+Every module is runnable on its own, e.g. ``python -m tools.glossary``.
+"""
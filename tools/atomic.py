@@ -0,0 +1,117 @@
+"""All-or-nothing updates of several messages/<locale>.json files.
+
+    with CatalogTransaction() as txn:
+        for lang, guide_data in translations.items():
+            data = txn.load(lang)
+            data["guide"] = guide_data
+            txn.stage(lang, data)
+
+Entering the block takes an exclusive lock (messages.lock next to the
+messages directory), so a concurrent run waits instead of interleaving its
+read-modify-write with ours. stage() serializes and fsyncs each catalog into
+a staging directory inside messages/, i.e. on the same filesystem. Only when
+the block exits cleanly are the staged files renamed over the originals;
+if any rename fails, the files already replaced are restored from hard-link
+backups. Each file is replaced by a single os.replace, so no reader ever
+sees a partially written catalog. The set of files is not switched
+atomically, though: a reader that opens several catalogs during the
+commit can get some old and some new ones. What the transaction does
+guarantee is that concurrent writers are serialized by the lock, and that
+a failed commit leaves every file as it was.
+"""
+import fcntl
+import os
+import shutil
+import tempfile
+
+from tools import catalog_cache, telemetry
+from tools.catalog import MESSAGES_DIR, catalog_path, dump_catalog, load_catalog
+
+
+def _fsync_dir(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class CatalogTransaction:
+    def __init__(self, messages_dir=MESSAGES_DIR):
+        self.messages_dir = os.path.abspath(messages_dir)
+        self.lock_path = self.messages_dir.rstrip(os.sep) + ".lock"
+        self.staged = {}
+        self._lock_fd = None
+        self._staging_dir = None
+
+    def __enter__(self):
+        self._lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        self._staging_dir = tempfile.mkdtemp(prefix=".staging-", dir=self.messages_dir)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.commit()
+        finally:
+            shutil.rmtree(self._staging_dir, ignore_errors=True)
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            os.close(self._lock_fd)
+        return False
+
+    def load(self, locale):
+        # Only bytes the cache actually read from disk are counted.
+        before = catalog_cache.STATS["bytes_read"]
+        data = load_catalog(locale, self.messages_dir)
+        telemetry.inc("bytes_read_total", catalog_cache.STATS["bytes_read"] - before, locale=locale)
+        return data
+
+    def stage(self, locale, data):
+        """Serialize and fsync one catalog into the staging directory."""
+        path = os.path.join(self._staging_dir, f"{locale}.json")
+        raw = dump_catalog(data).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        telemetry.inc("bytes_written_total", len(raw), locale=locale)
+        self.staged[locale] = path
+
+    def commit(self):
+        """Rename every staged file into place, rolling back on failure."""
+        if not self.staged:
+            return
+        with telemetry.span("commit", files=len(self.staged)):
+            self._commit()
+
+    def _commit(self):
+        _fsync_dir(self._staging_dir)
+        backup_dir = os.path.join(self._staging_dir, "backup")
+        os.mkdir(backup_dir)
+        done = []
+        try:
+            for locale, staged_path in self.staged.items():
+                target = catalog_path(locale, self.messages_dir)
+                backup = None
+                if os.path.exists(target):
+                    backup = os.path.join(backup_dir, f"{locale}.json")
+                    os.link(target, backup)
+                os.replace(staged_path, target)
+                done.append((target, backup))
+        except BaseException:
+            for target, backup in reversed(done):
+                if backup is None:
+                    os.remove(target)
+                else:
+                    os.replace(backup, target)
+            raise
+        finally:
+            _fsync_dir(self.messages_dir)
+
+
+def write_catalogs(catalogs, messages_dir=MESSAGES_DIR):
+    """Atomically replace several catalogs given as {locale: data}."""
+    with CatalogTransaction(messages_dir) as txn:
+        for locale, data in catalogs.items():
+            txn.stage(locale, data)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Memory-mappable binary catalogs for single-key lookups without parsing JSON.
+
+Each locale is exported to src/i18n/compiled/<locale>.cat (en fallbacks
+filled in, as in the JSON bundles). Layout, all integers little-endian:
+
+    header   "DCAT" magic, u16 version, u16 reserved, u32 count,
+             u32 blob offset, u32 blob size
+    hashes   count x u64, sorted: first 8 bytes of blake2b(key)
+    entries  count x (u32 key offset, u32 key length,
+                      u32 value offset, u32 value length), in hash order
+    blob     UTF-8 key and value bytes
+
+BinaryCatalog maps the file read-only and binary-searches the hash array
+in place, so a lookup touches a few pages and decodes only the value it
+returns. Every process that opens the same file shares the page cache.
+
+    python -m tools.binary_catalog export
+    python -m tools.binary_catalog get fr hero.title
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+from tools.catalog import DEFAULT_LOCALE, available_locales, load_flat_catalog
+from tools.fallback import materialize
+from tools.icu import COMPILED_DIR
+
+MAGIC = b"DCAT"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+HASH = struct.Struct("<Q")
+ENTRY = struct.Struct("<IIII")
+
+
+def key_hash(key_bytes):
+    return HASH.unpack(hashlib.blake2b(key_bytes, digest_size=8).digest())[0]
+
+
+def encode(flat):
+    """Serialize a flat {key: text} catalog to bytes."""
+    items = sorted(((key_hash(k.encode("utf-8")), k.encode("utf-8"), v.encode("utf-8")) for k, v in flat.items()))
+    count = len(items)
+    blob_offset = HEADER.size + count * (HASH.size + ENTRY.size)
+    hashes, entries, blob = bytearray(), bytearray(), bytearray()
+    for digest, key, value in items:
+        hashes += HASH.pack(digest)
+        entries += ENTRY.pack(len(blob), len(key), len(blob) + len(key), len(value))
+        blob += key + value
+    return HEADER.pack(MAGIC, VERSION, 0, count, blob_offset, len(blob)) + hashes + entries + blob
+
+
+def catalog_file(locale, out_dir=COMPILED_DIR):
+    return os.path.join(out_dir, f"{locale}.cat")
+
+
+def export(locales, out_dir=COMPILED_DIR):
+    """Write a .cat file per locale; return {locale: size in bytes}."""
+    os.makedirs(out_dir, exist_ok=True)
+    reference = load_flat_catalog(DEFAULT_LOCALE)
+    sizes = {}
+    for locale in locales:
+        flat = load_flat_catalog(locale)
+        if locale != DEFAULT_LOCALE:
+            flat, _, _ = materialize(reference, flat)
+        data = encode(flat)
+        path = catalog_file(locale, out_dir)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        sizes[locale] = len(data)
+    return sizes
+
+
+class BinaryCatalog:
+    """Read-only, memory-mapped view of one .cat file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self._count, self._blob, blob_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path}: not a version {VERSION} binary catalog")
+        if self._blob + blob_size != len(self._map):
+            self._map.close()
+            raise ValueError(f"{path}: truncated binary catalog")
+        self._entries = HEADER.size + self._count * HASH.size
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _find(self, key):
+        key_bytes = key.encode("utf-8")
+        digest = key_hash(key_bytes)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if HASH.unpack_from(self._map, HEADER.size + mid * HASH.size)[0] < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        # Walk the (almost always single) run of equal hashes.
+        while lo < self._count and HASH.unpack_from(self._map, HEADER.size + lo * HASH.size)[0] == digest:
+            key_off, key_len, value_off, value_len = ENTRY.unpack_from(self._map, self._entries + lo * ENTRY.size)
+            start = self._blob + key_off
+            if self._map[start:start + key_len] == key_bytes:
+                return value_off, value_len
+            lo += 1
+        return None
+
+    def get(self, key, default=None):
+        found = self._find(key)
+        if found is None:
+            return default
+        start = self._blob + found[0]
+        return self._map[start:start + found[1]].decode("utf-8")
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def keys(self):
+        """Yield every key, in hash order."""
+        for i in range(self._count):
+            key_off, key_len, _, _ = ENTRY.unpack_from(self._map, self._entries + i * ENTRY.size)
+            start = self._blob + key_off
+            yield self._map[start:start + key_len].decode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_parser = sub.add_parser("export", help="write <locale>.cat files")
+    export_parser.add_argument("--locale", action="append", help="export only these locales (repeatable)")
+    export_parser.add_argument("--out", default=COMPILED_DIR)
+    get_parser = sub.add_parser("get", help="look up one key")
+    get_parser.add_argument("locale")
+    get_parser.add_argument("key")
+    get_parser.add_argument("--dir", default=COMPILED_DIR)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        for locale, size in export(args.locale or available_locales(), args.out).items():
+            print(f"OK: {locale} ({size} bytes)")
+        return
+    with BinaryCatalog(catalog_file(args.locale, args.dir)) as catalog:
+        value = catalog.get(args.key)
+    if value is None:
+        sys.exit(f"{args.locale}: no key {args.key!r}")
+    print(value)
+
+
+if __name__ == "__main__":
+    main()
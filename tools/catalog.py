@@ -0,0 +1,94 @@
+"""Shared helpers for reading and writing messages/<locale>.json catalogs."""
+import hashlib
+import json
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MESSAGES_DIR = os.path.join(REPO_ROOT, "messages")
+CACHE_DIR = os.environ.get("DOPPLER_TOOLS_CACHE", os.path.join(REPO_ROOT, ".cache", "tools"))
+
+# Mirrors routing.locales and rtlLocales in src/i18n/routing.ts
+LOCALES = [
+    "en", "ru", "es", "pt", "fr", "zh", "de", "he", "fa", "ar", "hi",
+    "id", "tr", "vi", "th", "ms", "ko", "ja", "tl", "ur", "sw",
+]
+DEFAULT_LOCALE = "en"
+RTL_LOCALES = ["he", "fa", "ar", "ur"]
+
+
+def catalog_path(locale, messages_dir=MESSAGES_DIR):
+    return os.path.join(messages_dir, f"{locale}.json")
+
+
+def available_locales(messages_dir=MESSAGES_DIR):
+    """Locales with a catalog on disk, in routing order, then any extras sorted."""
+    found = {name[:-5] for name in os.listdir(messages_dir) if name.endswith(".json")}
+    known = [locale for locale in LOCALES if locale in found]
+    return known + sorted(found - set(LOCALES))
+
+
+def load_catalog(locale, messages_dir=MESSAGES_DIR):
+    from tools.catalog_cache import load_catalog_file
+
+    return load_catalog_file(catalog_path(locale, messages_dir))
+
+
+def load_flat_catalog(locale, messages_dir=MESSAGES_DIR):
+    from tools.catalog_cache import load_flat_catalog_file
+
+    return load_flat_catalog_file(catalog_path(locale, messages_dir))
+
+
+def load_catalogs(messages_dir=MESSAGES_DIR, locales=None):
+    """Load every catalog into a {locale: data} dict."""
+    locales = locales or available_locales(messages_dir)
+    return {locale: load_catalog(locale, messages_dir) for locale in locales}
+
+
+def dump_catalog(data):
+    """Serialize a catalog exactly the way the apply scripts write it."""
+    return json.dumps(data, ensure_ascii=False, indent=2) + "\n"
+
+
+def write_catalog(locale, data, messages_dir=MESSAGES_DIR):
+    with open(catalog_path(locale, messages_dir), "w", encoding="utf-8") as f:
+        f.write(dump_catalog(data))
+
+
+def flatten(data, prefix=""):
+    """Flatten nested namespaces into {"guide.android.title": "..."}."""
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        else:
+            flat[path] = value
+    return flat
+
+
+def unflatten(flat):
+    """Inverse of flatten()."""
+    data = {}
+    for path, value in flat.items():
+        node = data
+        *parents, leaf = path.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return data
+
+
+def file_digest(path, algorithm="sha256"):
+    h = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_path(*parts):
+    """Path under CACHE_DIR, creating parent directories as needed."""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
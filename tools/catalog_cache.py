@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Persistent cache of parsed catalogs and translation literal modules.
+
+Parsed results are stored with marshal under .cache/tools/parsed/, one blob
+per content hash. Every lookup reads and
+hashes the source file, so an edit is never missed however its size and
+mtime look; what the cache saves is the parse, and files with the same
+content (or a file touched but not changed) share one blob. Blobs are
+evicted least-recently-used once their total size exceeds
+DOPPLER_TOOLS_CACHE_MAX_BYTES (64 MiB by default). Set DOPPLER_TOOLS_NO_CACHE=1 to bypass the cache.
+
+    python -m tools.catalog_cache stats
+    python -m tools.catalog_cache clear
+"""
+import argparse
+import ast
+import atexit
+import hashlib
+import json
+import marshal
+import os
+import shutil
+import time
+
+from tools.catalog import CACHE_DIR, flatten
+
+PARSED_DIR = os.path.join(CACHE_DIR, "parsed")
+INDEX_PATH = os.path.join(PARSED_DIR, "index.json")
+MAX_BYTES = int(os.environ.get("DOPPLER_TOOLS_CACHE_MAX_BYTES", 64 << 20))
+FORMAT_VERSION = 2
+
+_index = None
+_dirty = False
+# Lookups served without parsing vs parsed, and source bytes actually
+# read; used by tools.telemetry and tools.atomic.
+STATS = {"hits": 0, "misses": 0, "bytes_read": 0}
+
+
+def enabled():
+    return not os.environ.get("DOPPLER_TOOLS_NO_CACHE")
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        try:
+            with open(INDEX_PATH, "r", encoding="utf-8") as f:
+                _index = json.load(f)
+            if _index.get("version") != FORMAT_VERSION:
+                raise ValueError
+        except (OSError, ValueError):
+            _index = {"version": FORMAT_VERSION, "blobs": {}}
+        atexit.register(_save_index)
+    return _index
+
+
+def _save_index():
+    if not _dirty:
+        return
+    os.makedirs(PARSED_DIR, exist_ok=True)
+    tmp = f"{INDEX_PATH}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(_index, f)
+    os.replace(tmp, INDEX_PATH)
+
+
+def _blob_path(key):
+    return os.path.join(PARSED_DIR, f"{key}.marshal")
+
+
+def _evict(index):
+    blobs = index["blobs"]
+    total = sum(blob["bytes"] for blob in blobs.values())
+    for key in sorted(blobs, key=lambda k: blobs[k]["used"]):
+        if total <= MAX_BYTES:
+            break
+        total -= blobs.pop(key)["bytes"]
+        try:
+            os.remove(_blob_path(key))
+        except FileNotFoundError:
+            pass
+
+
+def _read_blob(index, blob_key):
+    """The unmarshalled blob, or None when it is missing or unreadable."""
+    if blob_key not in index["blobs"]:
+        return None
+    try:
+        with open(_blob_path(blob_key), "rb") as f:
+            value = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError):
+        return None
+    index["blobs"][blob_key]["used"] = time.time()
+    return value
+
+
+def _store_blob(index, blob_key, value):
+    os.makedirs(PARSED_DIR, exist_ok=True)
+    tmp = f"{_blob_path(blob_key)}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        marshal.dump(value, f)
+    os.replace(tmp, _blob_path(blob_key))
+    index["blobs"][blob_key] = {"bytes": os.path.getsize(_blob_path(blob_key)), "used": time.time()}
+
+
+def cached(path, kind, parse):
+    """parse(raw_bytes) for the file at path, served from the cache when possible.
+
+    `kind` namespaces blobs so different parsers of the same file don't
+    collide.
+    """
+    global _dirty
+    if not enabled():
+        with open(path, "rb") as f:
+            raw = f.read()
+        STATS["bytes_read"] += len(raw)
+        return parse(raw)
+    index = _load_index()
+    # Size and mtime are not trusted: a same-size edit within the mtime
+    # granularity, or a restore that keeps old mtimes, would pass them.
+    # Hashing a catalog costs far less than parsing it.
+    with open(path, "rb") as f:
+        raw = f.read()
+    STATS["bytes_read"] += len(raw)
+    blob_key = f"{kind}-{hashlib.sha256(raw).hexdigest()}"
+    value = _read_blob(index, blob_key)
+    if value is not None:
+        STATS["hits"] += 1
+    else:
+        STATS["misses"] += 1
+        value = parse(raw)
+        _store_blob(index, blob_key, value)
+    _evict(index)
+    _dirty = True
+    return value
+
+
+def _parse_catalog(raw):
+    return json.loads(raw.decode("utf-8"))
+
+
+def _parse_flat_catalog(raw):
+    return flatten(_parse_catalog(raw))
+
+
+def load_catalog_file(path):
+    """Nested catalog dict for a messages JSON file (a fresh copy per call)."""
+    return cached(path, "catalog", _parse_catalog)
+
+
+def load_flat_catalog_file(path):
+    """Flattened {dotted.key: string} form of a messages JSON file."""
+    return cached(path, "flat", _parse_flat_catalog)
+
+
+def _parse_translations_module(raw):
+    """Literal `translations` dict built by translate_guides.py / apply_translations.py.
+
+    Only `translations = {...}` and `translations["xx"] = {...}` statements
+    are evaluated, with ast.literal_eval, so the module's apply loop never runs.
+    """
+    translations = {}
+    for node in ast.parse(raw).body:
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+            continue
+        target = node.targets[0]
+        if isinstance(target, ast.Name) and target.id == "translations":
+            translations = ast.literal_eval(node.value)
+        elif (isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name)
+              and target.value.id == "translations"):
+            translations[ast.literal_eval(target.slice)] = ast.literal_eval(node.value)
+    return translations
+
+
+def load_translations_module(path):
+    """The `translations` literal of a translation script, parsed once per content."""
+    return cached(path, "translations", _parse_translations_module)
+
+
+def _translations_part(path, part):
+    """The locale list ("locales") or one locale's dict of a translation script.
+
+    Each locale is its own blob, so a hit unmarshals just that locale. On a
+    miss the module is parsed once and every part is stored.
+    """
+    global _dirty
+    if not enabled():
+        translations = load_translations_module(path)
+        return list(translations) if part is None else translations[part]
+    index = _load_index()
+    with open(path, "rb") as f:
+        raw = f.read()
+    STATS["bytes_read"] += len(raw)
+    digest = hashlib.sha256(raw).hexdigest()
+    name = "locales" if part is None else f"locale.{part}"
+    value = _read_blob(index, f"translations.{name}-{digest}")
+    if value is not None:
+        STATS["hits"] += 1
+    else:
+        STATS["misses"] += 1
+        translations = _parse_translations_module(raw)
+        _store_blob(index, f"translations.locales-{digest}", list(translations))
+        for locale, data in translations.items():
+            _store_blob(index, f"translations.locale.{locale}-{digest}", data)
+        value = list(translations) if part is None else translations[part]
+        _evict(index)
+    _dirty = True
+    return value
+
+
+def translations_module_locales(path):
+    """Locale codes of a translation script's `translations`, in order."""
+    return _translations_part(path, None)
+
+
+def load_translations_locale(path, locale):
+    """One locale's dict from a translation script, without unmarshalling the rest."""
+    return _translations_part(path, locale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="show cache size and entries")
+    sub.add_parser("clear", help="delete the cache")
+    args = parser.parse_args()
+
+    if args.command == "clear":
+        shutil.rmtree(PARSED_DIR, ignore_errors=True)
+        print(f"Cleared {PARSED_DIR}")
+        return
+    index = _load_index()
+    total = sum(blob["bytes"] for blob in index["blobs"].values())
+    print(f"{len(index['blobs'])} blob(s), {total} bytes (limit {MAX_BYTES})")
+
+
+if __name__ == "__main__":
+    main()
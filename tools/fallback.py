@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Fill keys a locale is missing with the en text in the compiled bundles.
+
+A key en.json has but a locale lacks goes through next-intl's missing-message
+path on every render that touches it. The ICU build (tools/icu.py) runs
+each catalog through materialize() first, so the compiled bundle carries
+the en string instead and the source catalogs stay untouched. The filled
+paths are written to src/i18n/compiled/fallback.json.
+
+A path can only be filled when it doesn't clash with the locale's own
+shape (a string where en has a namespace, or the other way round); such
+paths are reported as conflicts and left for a translator.
+
+    python -m tools.fallback
+    python -m tools.fallback --locale fr --json
+"""
+import argparse
+import json
+import sys
+
+from tools.catalog import DEFAULT_LOCALE, available_locales, load_flat_catalog
+
+
+def _prefixes(path):
+    parts = path.split(".")
+    return (".".join(parts[:i]) for i in range(1, len(parts)))
+
+
+def materialize(reference, flat):
+    """Return (bundle, filled, conflicts) for a flat catalog against flat en.
+
+    bundle is a new flat dict with the locale's own strings first and the
+    en fallbacks appended in en order.
+    """
+    namespaces = {prefix for path in flat for prefix in _prefixes(path)}
+    bundle, filled, conflicts = dict(flat), [], []
+    for path, text in reference.items():
+        if path in flat:
+            continue
+        if path in namespaces or any(prefix in flat for prefix in _prefixes(path)):
+            conflicts.append(path)
+            continue
+        bundle[path] = text
+        filled.append(path)
+    return bundle, filled, conflicts
+
+
+def report(locales):
+    """{locale: {"filled": [...], "conflicts": [...]}} for locales with gaps."""
+    reference = load_flat_catalog(DEFAULT_LOCALE)
+    result = {}
+    for locale in locales:
+        if locale == DEFAULT_LOCALE:
+            continue
+        _, filled, conflicts = materialize(reference, load_flat_catalog(locale))
+        if filled or conflicts:
+            result[locale] = {"filled": filled, "conflicts": conflicts}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--locale", action="append", help="check only these locales (repeatable)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    locales = args.locale or available_locales()
+    gaps = report(locales)
+    if args.json:
+        print(json.dumps(gaps, ensure_ascii=False, indent=2))
+    else:
+        for locale in locales:
+            if locale == DEFAULT_LOCALE:
+                continue
+            if locale not in gaps:
+                print(f"OK: {locale}")
+                continue
+            for path in gaps[locale]["filled"]:
+                print(f"{locale}: {path}: filled from {DEFAULT_LOCALE}")
+            for path in gaps[locale]["conflicts"]:
+                print(f"{locale}: {path}: conflicts with the locale's own keys")
+    sys.exit(1 if any(gap["conflicts"] for gap in gaps.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
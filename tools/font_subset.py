@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Emit per-locale woff2 subsets of the display font.
+
+For each locale the codepoints used by messages/<locale>.json are collected,
+together with the shared UI chrome (printable ASCII and the symbols the
+components render outside the catalogs), intersected with the font's cmap,
+and written as public/fonts/subsets/<font>.<hash>.woff2, named by the
+subset's content so locales with identical sets share one file. Where a
+subset would not be smaller than the whole font as woff2, the locale uses
+that file instead. A manifest.json next to them maps each locale to its
+file and CSS unicode-range; --locale runs update only those locales'
+entries. src/app/[locale]/layout.tsx reads it (src/lib/font-subsets.ts),
+preloads the locale's subset and keeps the full font as the fallback for
+anything outside the range. The prebuild npm script runs this after the
+ICU build; without a manifest the layout serves the full font as before.
+
+Codepoint sets are cached in .cache/tools/font-subset/codepoints.json keyed
+by catalog digest; a locale is only re-read when its catalog changed, and a
+subset is only rebuilt when its codepoint set or the font changed.
+
+Requires fonttools and brotli (see tools/requirements.txt).
+"""
+import argparse
+import hashlib
+import json
+import os
+
+from tools.catalog import (
+    MESSAGES_DIR, REPO_ROOT, available_locales, cache_path, catalog_path, file_digest,
+    load_flat_catalog,
+)
+from tools.fontinfo import DEFAULT_FONT, load_metrics
+
+OUTPUT_DIR = os.path.join(REPO_ROOT, "public", "fonts", "subsets")
+PUBLIC_PREFIX = "/fonts/subsets"
+
+# Characters rendered by components regardless of locale.
+UI_CHROME = "".join(chr(code) for code in range(0x20, 0x7F)) + " ©—’“”•…→"
+
+
+def locale_codepoints(locale, messages_dir=MESSAGES_DIR):
+    text = "".join(load_flat_catalog(locale, messages_dir).values())
+    return {ord(ch) for ch in text}
+
+
+def cached_codepoints(locales, messages_dir=MESSAGES_DIR):
+    """{locale: set of codepoints}, re-reading only catalogs whose digest changed."""
+    path = cache_path("font-subset", "codepoints.json")
+    cache = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    result, dirty = {}, False
+    for locale in locales:
+        digest = file_digest(catalog_path(locale, messages_dir))
+        entry = cache.get(locale)
+        if entry is None or entry["digest"] != digest:
+            entry = {"digest": digest, "codepoints": sorted(locale_codepoints(locale, messages_dir))}
+            cache[locale] = entry
+            dirty = True
+        result[locale] = set(entry["codepoints"])
+    if dirty:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, path)
+    return result
+
+
+def unicode_range(codepoints):
+    """CSS unicode-range value for a set of codepoints, e.g. "U+20-7E,U+A9"."""
+    ranges = []
+    for code in sorted(codepoints):
+        if ranges and code == ranges[-1][1] + 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ",".join(f"U+{lo:X}" if lo == hi else f"U+{lo:X}-{hi:X}" for lo, hi in ranges)
+
+
+def _fonttools():
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        raise RuntimeError("font subsetting needs fonttools and brotli: pip install -r tools/requirements.txt")
+    return subset, TTFont
+
+
+def write_subset(font_path, codepoints, out_path):
+    # Only the features browsers turn on by default, and no hinting.
+    subset, TTFont = _fonttools()
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["kern", "liga", "calt", "locl"]
+    options.hinting = False
+    font = TTFont(font_path)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    # save_font applies options.flavor; font.save alone writes plain OTF.
+    subset.save_font(font, tmp, options)
+    os.replace(tmp, out_path)
+
+
+def write_full(font_path, out_path):
+    """The whole font as woff2, used where a subset would not be smaller."""
+    _, TTFont = _fonttools()
+    font = TTFont(font_path)
+    font.flavor = "woff2"
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    font.save(tmp)
+    os.replace(tmp, out_path)
+
+
+def load_manifest(output_dir=OUTPUT_DIR):
+    path = os.path.join(output_dir, "manifest.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build(font_path=DEFAULT_FONT, messages_dir=MESSAGES_DIR, output_dir=OUTPUT_DIR, locales=None):
+    """Write missing subsets and update the manifest; return the manifest dict.
+
+    Locales outside this run keep their manifest entries, and only files
+    that no entry references any more are deleted.
+    """
+    all_locales = available_locales(messages_dir)
+    locales = locales or all_locales
+    covered = set(load_metrics(font_path).codepoints)
+    chrome = {ord(ch) for ch in UI_CHROME}
+    font_digest = file_digest(font_path)
+    stem = os.path.splitext(os.path.basename(font_path))[0]
+    os.makedirs(output_dir, exist_ok=True)
+
+    full_name = f"{stem}.{font_digest[:8]}.woff2"
+    full_path = os.path.join(output_dir, full_name)
+    if not os.path.exists(full_path):
+        write_full(font_path, full_path)
+    full_bytes = os.path.getsize(full_path)
+
+    manifest = {locale: entry for locale, entry in load_manifest(output_dir).items() if locale in all_locales}
+    for locale, used in cached_codepoints(locales, messages_dir).items():
+        codepoints = sorted((used | chrome) & covered)
+        key = hashlib.sha256(f"{font_digest}:{codepoints}".encode()).hexdigest()[:8]
+        filename = f"{stem}.{key}.woff2"
+        out_path = os.path.join(output_dir, filename)
+        if not os.path.exists(out_path):
+            write_subset(font_path, codepoints, out_path)
+            print(f"OK: {locale} ({len(codepoints)} codepoints)")
+        if os.path.getsize(out_path) >= full_bytes:
+            filename, out_path, codepoints = full_name, full_path, sorted(covered)
+        manifest[locale] = {
+            "file": f"{PUBLIC_PREFIX}/{filename}",
+            "bytes": os.path.getsize(out_path),
+            "unicodeRange": unicode_range(codepoints),
+        }
+
+    # The full woff2 stays as the reference size even when no locale uses it.
+    referenced = {full_name} | {os.path.basename(entry["file"]) for entry in manifest.values()}
+    for name in os.listdir(output_dir):
+        if name.startswith(f"{stem}.") and name.endswith(".woff2") and name not in referenced:
+            os.remove(os.path.join(output_dir, name))
+    path = os.path.join(output_dir, "manifest.json")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--font", default=DEFAULT_FONT)
+    parser.add_argument("--messages-dir", default=MESSAGES_DIR)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--locale", action="append", help="limit to these locales (repeatable)")
+    args = parser.parse_args()
+
+    manifest = build(args.font, args.messages_dir, args.output_dir, args.locale)
+    files = {entry["file"]: entry["bytes"] for entry in manifest.values()}
+    stem = os.path.splitext(os.path.basename(args.font))[0]
+    full = os.path.join(args.output_dir, f"{stem}.{file_digest(args.font)[:8]}.woff2")
+    print(f"Done: {len(manifest)} locale(s), {len(files)} file(s), {sum(files.values())} bytes, "
+          f"full woff2 {os.path.getsize(full)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Read character coverage and advance widths from an OpenType font.
+
+Only the handful of sfnt tables the tooling needs are parsed (head, hhea,
+hmtx, OS/2, cmap), using the standard library alone. Parsed metrics are
+pickled under .cache/tools/fonts/ keyed by the font file's digest.
+"""
+import os
+import pickle
+import struct
+
+from tools.catalog import REPO_ROOT, cache_path, file_digest
+
+DEFAULT_FONT = os.path.join(REPO_ROOT, "src", "fonts", "FKRasterRomanCompact-Blended.otf")
+METRICS_VERSION = 1
+
+
+class FontMetrics:
+    """Units per em, cmap and per-codepoint advance widths of a font."""
+
+    def __init__(self, units_per_em, avg_advance, advances):
+        self.units_per_em = units_per_em
+        self.avg_advance = avg_advance
+        self.advances = advances  # {codepoint: advance in font units}
+
+    @property
+    def codepoints(self):
+        return self.advances.keys()
+
+
+def _tables(data):
+    if data[:4] not in (b"OTTO", b"\x00\x01\x00\x00", b"true"):
+        raise ValueError("not an OpenType/TrueType font")
+    (num_tables,) = struct.unpack_from(">H", data, 4)
+    tables = {}
+    for i in range(num_tables):
+        tag, _, offset, length = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+        tables[tag.decode("latin-1")] = (offset, length)
+    return tables
+
+
+def _cmap_subtable(data, offset):
+    """Map codepoint -> glyph id for one cmap subtable (formats 0, 4, 6 and 12)."""
+    (fmt,) = struct.unpack_from(">H", data, offset)
+    mapping = {}
+    if fmt == 0:
+        for code, glyph in enumerate(data[offset + 6:offset + 262]):
+            if glyph:
+                mapping[code] = glyph
+    elif fmt == 4:
+        (seg_x2,) = struct.unpack_from(">H", data, offset + 6)
+        ends = offset + 14
+        starts = ends + seg_x2 + 2
+        deltas = starts + seg_x2
+        range_offsets = deltas + seg_x2
+        for seg in range(seg_x2 // 2):
+            (end,) = struct.unpack_from(">H", data, ends + 2 * seg)
+            (start,) = struct.unpack_from(">H", data, starts + 2 * seg)
+            (delta,) = struct.unpack_from(">h", data, deltas + 2 * seg)
+            ro_pos = range_offsets + 2 * seg
+            (range_offset,) = struct.unpack_from(">H", data, ro_pos)
+            for code in range(start, end + 1):
+                if code == 0xFFFF:
+                    continue
+                if range_offset == 0:
+                    glyph = (code + delta) & 0xFFFF
+                else:
+                    (glyph,) = struct.unpack_from(">H", data, ro_pos + range_offset + 2 * (code - start))
+                    if glyph:
+                        glyph = (glyph + delta) & 0xFFFF
+                if glyph:
+                    mapping[code] = glyph
+    elif fmt == 6:
+        first, count = struct.unpack_from(">HH", data, offset + 6)
+        for i in range(count):
+            (glyph,) = struct.unpack_from(">H", data, offset + 10 + 2 * i)
+            if glyph:
+                mapping[first + i] = glyph
+    elif fmt == 12:
+        (groups,) = struct.unpack_from(">I", data, offset + 12)
+        for i in range(groups):
+            start, end, glyph = struct.unpack_from(">III", data, offset + 16 + 12 * i)
+            for code in range(start, end + 1):
+                mapping[code] = glyph + code - start
+    return mapping
+
+
+def _cmap(data, offset):
+    """Best Unicode cmap: full-repertoire (3,10)/(0,4+) first, then BMP subtables."""
+    _, count = struct.unpack_from(">HH", data, offset)
+    subtables = {}
+    for i in range(count):
+        platform, encoding, sub_offset = struct.unpack_from(">HHI", data, offset + 4 + 8 * i)
+        subtables[(platform, encoding)] = offset + sub_offset
+    for key in [(3, 10), (0, 6), (0, 4), (3, 1), (0, 3), (0, 2), (0, 1), (0, 0), (3, 0)]:
+        if key in subtables:
+            return _cmap_subtable(data, subtables[key])
+    return {}
+
+
+def parse_font(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    tables = _tables(data)
+    (units_per_em,) = struct.unpack_from(">H", data, tables["head"][0] + 18)
+    (num_h_metrics,) = struct.unpack_from(">H", data, tables["hhea"][0] + 34)
+    hmtx = tables["hmtx"][0]
+    glyph_advances = [struct.unpack_from(">H", data, hmtx + 4 * i)[0] for i in range(num_h_metrics)]
+    last = glyph_advances[-1] if glyph_advances else 0
+    cmap = _cmap(data, tables["cmap"][0])
+    advances = {
+        code: glyph_advances[glyph] if glyph < num_h_metrics else last
+        for code, glyph in cmap.items()
+    }
+    if "OS/2" in tables:
+        (avg_advance,) = struct.unpack_from(">h", data, tables["OS/2"][0] + 2)
+    else:
+        avg_advance = sum(advances.values()) // max(len(advances), 1)
+    return FontMetrics(units_per_em, avg_advance, advances)
+
+
+def load_metrics(path=DEFAULT_FONT):
+    """Parsed metrics for the font at path, reusing the on-disk cache when valid."""
+    digest = file_digest(path)[:16]
+    cached = cache_path("fonts", f"{digest}-v{METRICS_VERSION}.pickle")
+    if os.path.exists(cached):
+        with open(cached, "rb") as f:
+            return pickle.load(f)
+    metrics = parse_font(path)
+    tmp = f"{cached}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(metrics, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cached)
+    return metrics
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Check that glossary terms survive translation.
+
+FORMAL_SYSTEM_PROMPT in src/lib/openai/translate.ts asks the model to keep
+technical terms and brand names in English. This module verifies it: every
+term in tools/glossary.json is compiled once into an Aho-Corasick automaton,
+and each translated string (messages/*.json and blog_post_translations) must
+contain every term its English source contains, either verbatim or as one of
+the locale's approved renderings listed under "renderings", e.g.
+``{"fa": {"Android": ["اندروید"]}}``.
+
+The compiled automaton is pickled under .cache/tools/glossary/ keyed by the
+glossary file's digest, so repeated runs skip the build entirely.
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+from collections import Counter, deque
+
+from tools.catalog import (
+    DEFAULT_LOCALE, MESSAGES_DIR, available_locales, cache_path, load_flat_catalog,
+)
+from tools.supabase_rest import BLOG_TRANSLATION_FIELDS, load_blog_translations
+
+GLOSSARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "glossary.json")
+AUTOMATON_VERSION = 1
+
+_ASCII_WORD = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789")
+
+
+class Automaton:
+    """Aho-Corasick automaton over a fixed pattern set.
+
+    Each pattern carries the canonical term it stands for and the locales it
+    is valid in (None meaning every locale). ASCII patterns only match on
+    ASCII word boundaries so "IP" is not found inside "ZIP".
+    """
+
+    def __init__(self, patterns):
+        self.patterns = patterns  # [(text, term, locales)]
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for index, (text, _, _) in enumerate(patterns):
+            node = 0
+            for ch in text:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(index)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                target = self.goto[state].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+        self.bounded = [text[0] in _ASCII_WORD or text[-1] in _ASCII_WORD for text, _, _ in patterns]
+
+    def matches(self, text):
+        """Yield (end_index, pattern_index) for every match, in one pass over text."""
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for index in out[node]:
+                yield i, index
+
+    def count_terms(self, text, locale=None):
+        """Counter of canonical terms found in text, honouring locale-only renderings."""
+        counts = Counter()
+        n = len(text)
+        for end, index in self.matches(text):
+            pattern, term, locales = self.patterns[index]
+            if locales is not None and locale not in locales:
+                continue
+            if self.bounded[index]:
+                start = end - len(pattern) + 1
+                if start > 0 and text[start - 1] in _ASCII_WORD and pattern[0] in _ASCII_WORD:
+                    continue
+                if end + 1 < n and text[end + 1] in _ASCII_WORD and pattern[-1] in _ASCII_WORD:
+                    continue
+            counts[term] += 1
+        return counts
+
+
+def build_patterns(glossary):
+    patterns = {}
+    for term in glossary["terms"]:
+        patterns[term] = (term, None)
+    for locale, renderings in glossary.get("renderings", {}).items():
+        for term, forms in renderings.items():
+            for form in forms:
+                if form in patterns and patterns[form][1] is not None:
+                    patterns[form][1].add(locale)
+                elif form not in patterns:
+                    patterns[form] = (term, {locale})
+    return [(text, term, locales) for text, (term, locales) in sorted(patterns.items())]
+
+
+def load_automaton(glossary_path=GLOSSARY_PATH):
+    """Compiled automaton for the glossary, reusing the on-disk cache when valid."""
+    with open(glossary_path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw + str(AUTOMATON_VERSION).encode()).hexdigest()[:16]
+    path = cache_path("glossary", f"{digest}.pickle")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    automaton = Automaton(build_patterns(json.loads(raw)))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(automaton, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return automaton
+
+
+def compare(automaton, source, target, locale):
+    """Terms present in source more often than in target: {term: (expected, found)}."""
+    expected = automaton.count_terms(source)
+    if not expected:
+        return {}
+    found = automaton.count_terms(target, locale)
+    return {term: (count, found[term]) for term, count in expected.items() if found[term] < count}
+
+
+def check_messages(automaton, messages_dir=MESSAGES_DIR, locales=None):
+    """Yield findings for every translated message string."""
+    source = load_flat_catalog(DEFAULT_LOCALE, messages_dir)
+    source_terms = {key: automaton.count_terms(text) for key, text in source.items()}
+    source_terms = {key: counts for key, counts in source_terms.items() if counts}
+    for locale in locales or available_locales(messages_dir):
+        if locale == DEFAULT_LOCALE:
+            continue
+        target = load_flat_catalog(locale, messages_dir)
+        for key, expected in source_terms.items():
+            text = target.get(key)
+            if text is None:
+                continue
+            found = automaton.count_terms(text, locale)
+            for term, count in expected.items():
+                if found[term] < count:
+                    yield {"source": "messages", "locale": locale, "key": key,
+                           "term": term, "expected": count, "found": found[term]}
+
+
+def check_blog(automaton, rows, locales=None):
+    """Yield findings for blog_post_translations rows, compared against each post's en row."""
+    by_post = {}
+    for row in rows:
+        by_post.setdefault(row["post_id"], {})[row["locale"]] = row
+    for post_id, translations in by_post.items():
+        source = translations.get(DEFAULT_LOCALE)
+        if source is None:
+            continue
+        for locale, row in translations.items():
+            if locale == DEFAULT_LOCALE or (locales and locale not in locales):
+                continue
+            for field in BLOG_TRANSLATION_FIELDS:
+                if not source.get(field) or not row.get(field):
+                    continue
+                for term, (count, found) in compare(automaton, source[field], row[field], locale).items():
+                    yield {"source": "blog", "locale": locale, "key": f"{post_id}.{field}",
+                           "term": term, "expected": count, "found": found}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages-dir", default=MESSAGES_DIR)
+    parser.add_argument("--glossary", default=GLOSSARY_PATH)
+    parser.add_argument("--locale", action="append", help="limit to these locales (repeatable)")
+    parser.add_argument("--blog", action="store_true", help="also scan blog_post_translations from Supabase")
+    parser.add_argument("--blog-json", help="scan a JSON export of blog_post_translations instead of Supabase")
+    parser.add_argument("--json", action="store_true", help="print findings as JSON lines")
+    args = parser.parse_args()
+
+    automaton = load_automaton(args.glossary)
+    findings = list(check_messages(automaton, args.messages_dir, args.locale))
+    if args.blog or args.blog_json:
+        findings.extend(check_blog(automaton, load_blog_translations(args.blog_json), args.locale))
+
+    for finding in findings:
+        if args.json:
+            print(json.dumps(finding, ensure_ascii=False))
+        else:
+            print(f"{finding['locale']}: {finding['key']}: \"{finding['term']}\" "
+                  f"expected {finding['expected']}, found {finding['found']}")
+    if not args.json:
+        print(f"{len(findings)} glossary violation(s)")
+    sys.exit(1 if findings else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Report message characters the display font has no glyph for.
+
+The font's cmap is turned into a codepoint bitset (a Python int with bit N
+set when U+N is mapped) and cached next to the parsed metrics in
+.cache/tools/fonts/. Each locale's characters are folded into a bitset the
+same way; `locale_bits & ~font_bits` yields the uncovered characters in one
+operation, and only locales with a non-zero result are scanned key by key.
+Invisible format and control characters (ZWNJ, bidi marks, ...) are ignored.
+
+Only the keys a font actually renders are checked. tools/font_usage.json
+maps each font (path relative to the repo root) to key patterns, each with
+the locales where the component swaps in another font (skip_locales; for
+hero.headlinePart2 this mirrors FALLBACK_FONT_LOCALES in
+src/components/sections/hero.tsx). A font missing from that file, or
+--all-keys, checks every key.
+
+    python -m tools.glyph_coverage --summary
+    python -m tools.glyph_coverage --key "cta.*.titlePlayful"
+    python -m tools.glyph_coverage --all-keys --summary
+"""
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import unicodedata
+
+from tools.catalog import (
+    MESSAGES_DIR, REPO_ROOT, available_locales, cache_path, file_digest, load_flat_catalog,
+)
+from tools.fontinfo import DEFAULT_FONT, load_metrics
+
+IGNORED_CATEGORIES = ("Cc", "Cf", "Zl", "Zp")
+USAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "font_usage.json")
+
+
+def to_bitset(codepoints):
+    bits = 0
+    for code in codepoints:
+        bits |= 1 << code
+    return bits
+
+
+def from_bitset(bits):
+    codepoints = []
+    while bits:
+        low = bits & -bits
+        codepoints.append(low.bit_length() - 1)
+        bits ^= low
+    return codepoints
+
+
+def font_bitset(font_path=DEFAULT_FONT):
+    """Codepoint bitset of the font's cmap, cached by font digest."""
+    path = cache_path("fonts", f"{file_digest(font_path)[:16]}-cmap.bits")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return int.from_bytes(f.read(), "little")
+    bits = to_bitset(load_metrics(font_path).codepoints)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(bits.to_bytes((bits.bit_length() + 7) // 8, "little"))
+    os.replace(tmp, path)
+    return bits
+
+
+def load_usage(font_path, path=USAGE_PATH):
+    """[(key pattern, locales to skip)] rendered in font_path, or None if it is not listed."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        fonts = json.load(f)["fonts"]
+    name = os.path.relpath(os.path.abspath(font_path), REPO_ROOT).replace(os.sep, "/")
+    if name not in fonts:
+        return None
+    return [(pattern, set(spec.get("skip_locales", ()))) for pattern, spec in fonts[name].items()]
+
+
+def rendered(flat, locale, usage):
+    """The entries of flat that are shown in the font for this locale."""
+    return {
+        key: text for key, text in flat.items()
+        if any(locale not in skip and fnmatch.fnmatchcase(key, pattern) for pattern, skip in usage)
+    }
+
+
+def visible(ch):
+    return unicodedata.category(ch) not in IGNORED_CATEGORIES
+
+
+def uncovered_by_key(flat, covered_bits):
+    """{key: sorted uncovered chars} for one flattened catalog."""
+    chars = set("".join(flat.values()))
+    missing_bits = to_bitset(map(ord, chars)) & ~covered_bits
+    if not missing_bits:
+        return {}
+    missing = {chr(code) for code in from_bitset(missing_bits) if visible(chr(code))}
+    if not missing:
+        return {}
+    result = {}
+    for key, text in flat.items():
+        hit = missing.intersection(text)
+        if hit:
+            result[key] = sorted(hit)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages-dir", default=MESSAGES_DIR)
+    parser.add_argument("--font", default=DEFAULT_FONT)
+    parser.add_argument("--locale", action="append", help="limit to these locales (repeatable)")
+    parser.add_argument("--key", action="append", help="only keys matching this fnmatch pattern (repeatable)")
+    parser.add_argument("--usage", default=USAGE_PATH, help="font to rendered keys mapping")
+    parser.add_argument("--all-keys", action="store_true", help="check every key, not only those the font renders")
+    parser.add_argument("--summary", action="store_true", help="one line per locale instead of per key")
+    parser.add_argument("--json", action="store_true", help="print {locale: {key: chars}} as JSON")
+    args = parser.parse_args()
+
+    covered = font_bitset(args.font)
+    usage = None if args.all_keys else load_usage(args.font, args.usage)
+    report = {}
+    for locale in args.locale or available_locales(args.messages_dir):
+        flat = load_flat_catalog(locale, args.messages_dir)
+        if usage is not None:
+            flat = rendered(flat, locale, usage)
+        if args.key:
+            flat = {k: v for k, v in flat.items() if any(fnmatch.fnmatchcase(k, p) for p in args.key)}
+        missing = uncovered_by_key(flat, covered)
+        if missing:
+            report[locale] = missing
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for locale, missing in report.items():
+            chars = sorted(set().union(*missing.values()))
+            if args.summary:
+                print(f"{locale}: {len(chars)} uncovered character(s) in {len(missing)} key(s)")
+                continue
+            for key, key_chars in missing.items():
+                print(f"{locale}: {key}: {' '.join(key_chars)}")
+        print(f"{len(report)} locale(s) with uncovered characters")
+    sys.exit(1 if report else 0)
+
+
+if __name__ == "__main__":
+    main()
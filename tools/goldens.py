@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Golden hashes for every (locale, namespace) of the shipped catalogs.
+
+tools/goldens.json records a canonical sha256 of each top-level namespace of
+each messages/<locale>.json. `check` recomputes them and compares; only
+namespaces whose hash differs are expanded into a structural diff against
+the same namespace at --baseline-ref (HEAD by default), so a clean 21-locale
+check costs one hash per namespace.
+
+    python -m tools.goldens record
+    python -m tools.goldens check
+    python -m tools.goldens check --run "python3 apply_translations.py"
+
+With --run, the command is executed against a scratch copy of messages/
+(passed as $MESSAGES_DIR) and its output is what gets checked, so tooling
+refactors can be verified without touching the real catalogs. Both apply
+scripts honour $MESSAGES_DIR; apply_batch1.py runs translate_guides.py in
+a separate namespace so that script's own MESSAGES_DIR cannot override
+it. A command that writes to a hard-coded path is not redirected.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from tools.catalog import MESSAGES_DIR, REPO_ROOT, available_locales, load_catalog
+from tools.jsonpatch import diff
+
+GOLDENS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "goldens.json")
+
+
+def namespace_hash(value):
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def compute(messages_dir=MESSAGES_DIR):
+    return {
+        locale: {namespace: namespace_hash(value) for namespace, value in load_catalog(locale, messages_dir).items()}
+        for locale in available_locales(messages_dir)
+    }
+
+
+def compare(goldens, current):
+    """Yield (locale, namespace, status) for every mismatch."""
+    for locale in sorted(set(goldens) | set(current)):
+        expected, actual = goldens.get(locale, {}), current.get(locale, {})
+        for namespace in sorted(set(expected) | set(actual)):
+            if namespace not in actual:
+                yield locale, namespace, "missing"
+            elif namespace not in expected:
+                yield locale, namespace, "unexpected"
+            elif expected[namespace] != actual[namespace]:
+                yield locale, namespace, "changed"
+
+
+def baseline_namespace(locale, namespace, ref):
+    """The namespace as committed at `ref`, or None if unavailable."""
+    result = subprocess.run(
+        ["git", "show", f"{ref}:messages/{locale}.json"],
+        cwd=REPO_ROOT, capture_output=True,
+    )
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout.decode("utf-8")).get(namespace)
+
+
+def report(goldens, messages_dir, baseline_ref):
+    mismatches = list(compare(goldens, compute(messages_dir)))
+    for locale, namespace, status in mismatches:
+        print(f"MISMATCH {locale}.{namespace}: {status}")
+        if status != "changed":
+            continue
+        old = baseline_namespace(locale, namespace, baseline_ref)
+        if old is None or namespace_hash(old) != goldens[locale][namespace]:
+            print(f"  (no copy of the golden {locale}.{namespace} at {baseline_ref} to diff against)")
+            continue
+        new = load_catalog(locale, messages_dir)[namespace]
+        for op in diff(old, new, f"/{namespace}"):
+            value = f" {json.dumps(op['value'], ensure_ascii=False)}" if "value" in op else ""
+            print(f"  {op['op']:7} {op['path']}{value}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages-dir", default=MESSAGES_DIR)
+    parser.add_argument("--goldens", default=GOLDENS_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("record", help="store the current hashes as goldens")
+    check = sub.add_parser("check", help="compare the current hashes against the goldens")
+    check.add_argument("--baseline-ref", default="HEAD", help="git ref holding the golden catalogs for diffs")
+    check.add_argument("--run", help="command to run against a scratch copy of messages/ before checking")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        with open(args.goldens, "w", encoding="utf-8") as f:
+            json.dump(compute(args.messages_dir), f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Recorded goldens to {args.goldens}")
+        return
+
+    with open(args.goldens, "r", encoding="utf-8") as f:
+        goldens = json.load(f)
+    messages_dir = args.messages_dir
+    scratch = None
+    try:
+        if args.run:
+            scratch = tempfile.mkdtemp(prefix="goldens-")
+            messages_dir = os.path.join(scratch, "messages")
+            shutil.copytree(args.messages_dir, messages_dir)
+            env = dict(os.environ, MESSAGES_DIR=messages_dir)
+            subprocess.run(args.run, shell=True, cwd=REPO_ROOT, env=env, check=True)
+        mismatches = report(goldens, messages_dir, args.baseline_ref)
+    finally:
+        if scratch:
+            shutil.rmtree(scratch, ignore_errors=True)
+    print(f"{len(mismatches)} mismatch(es)")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""Validate ICU messages against en and build the bundles the app serves.
+
+Every string in messages/*.json is parsed once with the same grammar as
+@formatjs/icu-messageformat-parser (the parser behind next-intl), into
+node arrays in its numeric AST format:
+
+    0 literal  1 argument  2 number  3 date  4 time
+    5 select   6 plural    7 pound   8 tag
+
+A message that fails to parse, or whose argument names, argument types or
+tags differ from en, fails the build. Plural branches are not compared:
+each language has its own plural categories. For each locale that passes,
+src/i18n/compiled/<locale>.json is written: the minified message tree with
+keys the locale lacks filled from en (see tools/fallback.py).
+
+next-intl 3 has no hook for precompiled formatters, so the ASTs are only
+used for validation here (and by tools that rewrite messages, such as
+tools/pseudo_locale.py); the runtime still parses the message strings.
+src/i18n/request.ts serves the compiled bundle in production builds when
+it exists, and messages/<locale>.json otherwise, so `next dev` keeps
+hot-reloading the source catalogs and a checkout without Python still
+runs. `npm run build` runs this first (the prebuild script) when python3
+is available and stops on any failure.
+
+    python -m tools.icu
+    python -m tools.icu --check
+    python -m tools.icu --locale fr --json
+"""
+import argparse
+import json
+import os
+import sys
+
+from tools.catalog import DEFAULT_LOCALE, REPO_ROOT, available_locales, load_flat_catalog, unflatten
+from tools.fallback import materialize
+
+COMPILED_DIR = os.path.join(REPO_ROOT, "src", "i18n", "compiled")
+
+LITERAL, ARGUMENT, NUMBER, DATE, TIME, SELECT, PLURAL, POUND, TAG = range(9)
+SIMPLE_TYPES = {"number": NUMBER, "date": DATE, "time": TIME}
+PLURAL_TYPES = {"plural": "cardinal", "selectordinal": "ordinal"}
+
+
+class IcuSyntaxError(ValueError):
+    def __init__(self, message, offset):
+        super().__init__(f"{message} at offset {offset}")
+        self.offset = offset
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def error(self, message):
+        raise IcuSyntaxError(message, self.pos)
+
+    def peek(self, offset=0):
+        index = self.pos + offset
+        return self.text[index] if index < len(self.text) else ""
+
+    def skip_space(self):
+        while self.peek().isspace():
+            self.pos += 1
+
+    def identifier(self):
+        start = self.pos
+        while self.peek() and not self.peek().isspace() and self.peek() not in "{},#<>'/=":
+            self.pos += 1
+        if start == self.pos:
+            self.error("expected an identifier")
+        return self.text[start:self.pos]
+
+    def expect(self, char):
+        self.skip_space()
+        if self.peek() != char:
+            self.error(f"expected {char!r}")
+        self.pos += 1
+
+    def message(self, depth, in_plural, tag=None):
+        nodes = []
+        while self.pos < len(self.text):
+            char = self.peek()
+            if char == "{":
+                nodes.append(self.argument(depth))
+            elif char == "}" and depth > 0:
+                break
+            elif char == "}":
+                self.error("unmatched '}'")
+            elif char == "#" and in_plural:
+                self.pos += 1
+                nodes.append({"type": POUND})
+            elif char == "<" and self.peek(1) == "/":
+                if tag is None:
+                    self.error("unexpected closing tag")
+                break
+            elif char == "<" and self.peek(1).isalpha():
+                nodes.append(self.tag(depth, in_plural))
+            else:
+                self.literal(nodes, depth, in_plural)
+        if tag is not None and self.peek() != "<":
+            self.error(f"unclosed tag <{tag}>")
+        return nodes
+
+    def literal(self, nodes, depth, in_plural):
+        out = []
+        while self.pos < len(self.text):
+            char = self.peek()
+            if char == "'":
+                following = self.peek(1)
+                if following == "'":
+                    out.append("'")
+                    self.pos += 2
+                elif following in ("{", "}", "<", ">") or (following == "#" and in_plural):
+                    self.pos += 1
+                    while True:
+                        if self.pos >= len(self.text):
+                            break  # an unterminated quote runs to the end, as in ICU
+                        if self.peek() == "'" and self.peek(1) == "'":
+                            out.append("'")
+                            self.pos += 2
+                        elif self.peek() == "'":
+                            self.pos += 1
+                            break
+                        else:
+                            out.append(self.peek())
+                            self.pos += 1
+                else:
+                    out.append("'")
+                    self.pos += 1
+            elif char == "{" or (char == "}" and depth > 0) or (char == "#" and in_plural):
+                break
+            elif char == "}":
+                self.error("unmatched '}'")
+            elif char == "<" and (self.peek(1) == "/" or self.peek(1).isalpha()):
+                break
+            else:
+                out.append(char)
+                self.pos += 1
+        if nodes and nodes[-1]["type"] == LITERAL:
+            nodes[-1]["value"] += "".join(out)
+        else:
+            nodes.append({"type": LITERAL, "value": "".join(out)})
+
+    def tag(self, depth, in_plural):
+        self.pos += 1
+        name = self.identifier()
+        if self.peek() == "/" and self.peek(1) == ">":
+            self.pos += 2
+            return {"type": LITERAL, "value": f"<{name}/>"}
+        self.expect(">")
+        children = self.message(depth, in_plural, tag=name)
+        self.pos += 2  # "</"
+        if self.identifier() != name:
+            self.error(f"mismatched closing tag for <{name}>")
+        self.expect(">")
+        return {"type": TAG, "value": name, "children": children}
+
+    def argument(self, depth):
+        self.pos += 1
+        self.skip_space()
+        name = self.identifier()
+        self.skip_space()
+        if self.peek() == "}":
+            self.pos += 1
+            return {"type": ARGUMENT, "value": name}
+        self.expect(",")
+        self.skip_space()
+        kind = self.identifier()
+        self.skip_space()
+        if kind in SIMPLE_TYPES:
+            style = None
+            if self.peek() == ",":
+                self.pos += 1
+                start = self.pos
+                nested = 0
+                while self.pos < len(self.text) and (self.peek() != "}" or nested):
+                    nested += {"{": 1, "}": -1}.get(self.peek(), 0)
+                    self.pos += 1
+                style = self.text[start:self.pos].strip()
+                if not style:
+                    self.error(f"empty {kind} style")
+            self.expect("}")
+            return {"type": SIMPLE_TYPES[kind], "value": name, "style": style}
+        if kind == "select" or kind in PLURAL_TYPES:
+            self.expect(",")
+            offset = 0
+            self.skip_space()
+            if kind in PLURAL_TYPES and self.text.startswith("offset:", self.pos):
+                self.pos += len("offset:")
+                self.skip_space()
+                start = self.pos
+                while self.peek().isdigit():
+                    self.pos += 1
+                if start == self.pos:
+                    self.error("expected an offset")
+                offset = int(self.text[start:self.pos])
+            options = {}
+            while True:
+                self.skip_space()
+                if self.peek() == "}":
+                    self.pos += 1
+                    break
+                if self.peek() == "=":
+                    self.pos += 1
+                    selector = "=" + self.identifier()
+                else:
+                    selector = self.identifier()
+                if selector in options:
+                    self.error(f"duplicate selector {selector!r}")
+                self.expect("{")
+                value = self.message(depth + 1, kind in PLURAL_TYPES)
+                self.expect("}")
+                options[selector] = {"value": value}
+            if "other" not in options:
+                self.error(f"{kind} argument {name!r} has no 'other' option")
+            if kind == "select":
+                return {"type": SELECT, "value": name, "options": options}
+            return {"type": PLURAL, "value": name, "options": options, "offset": offset,
+                    "pluralType": PLURAL_TYPES[kind]}
+        self.error(f"unknown argument type {kind!r}")
+
+
+def parse(text):
+    """Parse an ICU message into a formatjs-compatible AST (list of nodes)."""
+    parser = _Parser(text)
+    nodes = parser.message(0, False)
+    if parser.pos < len(parser.text):
+        parser.error("unexpected input")
+    return nodes
+
+
+def _escape(text, in_plural, after=""):
+    special = "{}<>" + ("#" if in_plural else "")
+    out = []
+    for i, char in enumerate(text):
+        following = text[i + 1:i + 2] or after
+        if char == "'":
+            # A lone apostrophe is literal; double it only where it would start a quote.
+            out.append("''" if following and following in special + "'" else "'")
+        elif char in special:
+            out.append(f"'{char}'")
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def format_ast(nodes, in_plural=False, after=""):
+    """Serialize an AST back to ICU message syntax (inverse of parse()).
+
+    after is the character that will follow the output, which decides
+    whether a trailing apostrophe needs doubling.
+    """
+    out = []
+    for i, node in enumerate(nodes):
+        kind = node["type"]
+        if kind == LITERAL:
+            # Any node after a literal starts with "{", "#" or "<".
+            out.append(_escape(node["value"], in_plural, "{" if i + 1 < len(nodes) else after))
+        elif kind == ARGUMENT:
+            out.append(f"{{{node['value']}}}")
+        elif kind in (NUMBER, DATE, TIME):
+            name = {NUMBER: "number", DATE: "date", TIME: "time"}[kind]
+            style = f", {node['style']}" if node.get("style") else ""
+            out.append(f"{{{node['value']}, {name}{style}}}")
+        elif kind == POUND:
+            out.append("#")
+        elif kind == TAG:
+            out.append(f"<{node['value']}>{format_ast(node['children'], in_plural, '<')}</{node['value']}>")
+        else:
+            plural = kind == PLURAL
+            if plural:
+                name = "plural" if node["pluralType"] == "cardinal" else "selectordinal"
+                head = f"{name}, offset:{node['offset']}" if node["offset"] else f"{name},"
+            else:
+                head = "select,"
+            options = " ".join(
+                f"{selector} {{{format_ast(option['value'], plural, '}')}}}" for selector, option in node["options"].items()
+            )
+            out.append(f"{{{node['value']}, {head} {options}}}")
+    return "".join(out)
+
+
+def is_plain(nodes, text):
+    """True when the message renders as its own source text."""
+    return not nodes or (len(nodes) == 1 and nodes[0]["type"] == LITERAL and nodes[0]["value"] == text)
+
+
+def signature(nodes, out=None):
+    """{name: type} for every argument and tag in the message."""
+    out = {} if out is None else out
+    for node in nodes:
+        if node["type"] in (ARGUMENT, NUMBER, DATE, TIME):
+            out.setdefault(node["value"], node["type"])
+        elif node["type"] == TAG:
+            out[f"<{node['value']}>"] = TAG
+            signature(node["children"], out)
+        elif node["type"] in (SELECT, PLURAL):
+            out[node["value"]] = node["type"]
+            for option in node["options"].values():
+                signature(option["value"], out)
+    return out
+
+
+def compile_catalog(flat, reference=None):
+    """Return (ast, errors) for a flat catalog; ast holds only non-plain messages."""
+    ast, errors = {}, []
+    for key, text in flat.items():
+        try:
+            nodes = parse(text)
+        except IcuSyntaxError as e:
+            errors.append((key, str(e)))
+            continue
+        if not is_plain(nodes, text):
+            ast[key] = nodes
+        if reference is not None and key in reference:
+            expected, actual = reference[key], signature(nodes)
+            if expected != actual:
+                errors.append((key, f"arguments {sorted(actual.items())} differ from en {sorted(expected.items())}"))
+    return ast, errors
+
+
+def reference_signatures(en_flat):
+    signatures = {}
+    for key, text in en_flat.items():
+        try:
+            signatures[key] = signature(parse(text))
+        except IcuSyntaxError:
+            pass  # reported when en itself is compiled
+    return signatures
+
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def build(locales, out_dir=COMPILED_DIR, write=True):
+    """Compile each locale; return {locale: [(key, error)]}."""
+    en_flat = load_flat_catalog(DEFAULT_LOCALE)
+    reference = reference_signatures(en_flat)
+    if write:
+        os.makedirs(out_dir, exist_ok=True)
+    failures, filled = {}, {}
+    for locale in locales:
+        flat = load_flat_catalog(locale)
+        if locale != DEFAULT_LOCALE:
+            flat, paths, _ = materialize(en_flat, flat)
+            if paths:
+                filled[locale] = paths
+        _, errors = compile_catalog(flat, None if locale == DEFAULT_LOCALE else reference)
+        if errors:
+            failures[locale] = errors
+        elif write:
+            _write_json(os.path.join(out_dir, f"{locale}.json"), unflatten(flat))
+    if write:
+        # Merge, so a --locale run keeps the other locales' entries.
+        fallback_path = os.path.join(out_dir, "fallback.json")
+        merged = {}
+        if os.path.exists(fallback_path):
+            with open(fallback_path, "r", encoding="utf-8") as f:
+                merged = json.load(f)
+        for locale in locales:
+            merged.pop(locale, None)
+        merged.update(filled)
+        _write_json(fallback_path, dict(sorted(merged.items())))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--locale", action="append", help="compile only these locales (repeatable)")
+    parser.add_argument("--out", default=COMPILED_DIR)
+    parser.add_argument("--check", action="store_true", help="validate only, write nothing")
+    parser.add_argument("--json", action="store_true", help="print errors as JSON")
+    args = parser.parse_args()
+
+    locales = args.locale or available_locales()
+    failures = build(locales, args.out, write=not args.check)
+    if args.json:
+        print(json.dumps({locale: [list(e) for e in errors] for locale, errors in failures.items()},
+                         ensure_ascii=False, indent=2))
+    else:
+        for locale in locales:
+            if locale not in failures:
+                print(f"OK: {locale}")
+                continue
+            for key, error in failures[locale]:
+                print(f"{locale}: {key}: {error}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Interned, all-locale catalog representation and a duplication report.
+
+InternedCatalogs keeps one StringTable for every key path and message
+string across all locales. Each locale is an array of string ids indexed
+by key id (-1 where the locale lacks the key), so a string repeated
+across devices, namespaces or locales ("App Store", the Telegram bot
+steps in every guide) is stored once, and comparing two messages is an
+integer compare.
+
+    python -m tools.intern
+    python -m tools.intern --top 20 --memory
+    python -m tools.intern --json
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from array import array
+from collections import Counter
+
+from tools.catalog import DEFAULT_LOCALE, MESSAGES_DIR, available_locales, load_flat_catalog
+
+MISSING = -1
+
+
+class StringTable:
+    """Append-only table mapping strings to dense integer ids."""
+
+    def __init__(self):
+        self._strings = []
+        self._ids = {}
+
+    def intern(self, text):
+        sid = self._ids.get(text)
+        if sid is None:
+            sid = self._ids[text] = len(self._strings)
+            self._strings.append(text)
+        return sid
+
+    def id_of(self, text, default=MISSING):
+        return self._ids.get(text, default)
+
+    def __getitem__(self, sid):
+        return self._strings[sid]
+
+    def __len__(self):
+        return len(self._strings)
+
+    def __iter__(self):
+        return iter(self._strings)
+
+
+class InternedCatalogs:
+    """Flat catalogs for many locales sharing one key table and one string table."""
+
+    def __init__(self):
+        self.keys = StringTable()
+        self.strings = StringTable()
+        self._values = {}
+
+    @classmethod
+    def load(cls, locales=None, messages_dir=MESSAGES_DIR):
+        catalogs = cls()
+        for locale in locales or available_locales(messages_dir):
+            catalogs.add(locale, load_flat_catalog(locale, messages_dir))
+        return catalogs
+
+    def add(self, locale, flat):
+        values = self._values.setdefault(locale, array("i"))
+        for key, text in flat.items():
+            kid = self.keys.intern(key)
+            if kid >= len(values):
+                values.extend([MISSING] * (kid + 1 - len(values)))
+            values[kid] = self.strings.intern(text)
+
+    @property
+    def locales(self):
+        return list(self._values)
+
+    def value_id(self, locale, key):
+        kid = self.keys.id_of(key)
+        values = self._values[locale]
+        return values[kid] if 0 <= kid < len(values) else MISSING
+
+    def get(self, locale, key, default=None):
+        sid = self.value_id(locale, key)
+        return default if sid == MISSING else self.strings[sid]
+
+    def ids(self, locale):
+        """Yield (key_id, string_id) for the keys the locale defines."""
+        for kid, sid in enumerate(self._values[locale]):
+            if sid != MISSING:
+                yield kid, sid
+
+    def items(self, locale):
+        for kid, sid in self.ids(locale):
+            yield self.keys[kid], self.strings[sid]
+
+    def to_flat(self, locale):
+        return dict(self.items(locale))
+
+    def same(self, locale_a, locale_b, key):
+        """True when both locales define key with the identical string."""
+        sid = self.value_id(locale_a, key)
+        return sid != MISSING and sid == self.value_id(locale_b, key)
+
+    def identical_to(self, locale, reference=DEFAULT_LOCALE):
+        """Keys whose string in locale is the same as in reference (often untranslated)."""
+        ref = self._values[reference]
+        return [
+            self.keys[kid] for kid, sid in self.ids(locale)
+            if kid < len(ref) and ref[kid] == sid
+        ]
+
+
+def duplication_report(catalogs, top=10):
+    """Counts of entries vs unique strings, per locale and across all locales."""
+    per_locale, usage = {}, Counter()
+    locales_of = {}
+    for locale in catalogs.locales:
+        sids = [sid for _, sid in catalogs.ids(locale)]
+        per_locale[locale] = {
+            "entries": len(sids),
+            "unique": len(set(sids)),
+            "ratio": round(len(sids) / max(len(set(sids)), 1), 3),
+        }
+        usage.update(sids)
+        for sid in set(sids):
+            locales_of.setdefault(sid, set()).add(locale)
+    entries = sum(usage.values())
+    shared = [sid for sid, locales in locales_of.items() if len(locales) > 1]
+    return {
+        "entries": entries,
+        "unique": len(catalogs.strings),
+        "ratio": round(entries / max(len(catalogs.strings), 1), 3),
+        "shared_across_locales": len(shared),
+        "chars_total": sum(len(catalogs.strings[sid]) * count for sid, count in usage.items()),
+        "chars_unique": sum(len(text) for text in catalogs.strings),
+        "locales": per_locale,
+        "top": [
+            {"text": catalogs.strings[sid], "count": count, "locales": len(locales_of[sid])}
+            for sid, count in usage.most_common(top)
+        ],
+    }
+
+
+def memory_comparison(locales=None):
+    """Bytes allocated holding all flat catalogs as dicts vs interned."""
+    locales = locales or available_locales()
+    tracemalloc.start()
+    plain = {locale: load_flat_catalog(locale) for locale in locales}
+    plain_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del plain
+    tracemalloc.start()
+    interned = InternedCatalogs()
+    for locale in locales:
+        interned.add(locale, load_flat_catalog(locale))
+    interned_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return plain_bytes, interned_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=10, help="most repeated strings to list")
+    parser.add_argument("--memory", action="store_true", help="compare memory use with plain dicts")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = duplication_report(InternedCatalogs.load(), args.top)
+    if args.memory:
+        report["memory"] = dict(zip(("plain_bytes", "interned_bytes"), memory_comparison()))
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+    for locale, stats in report["locales"].items():
+        print(f"{locale}: {stats['entries']} entries, {stats['unique']} unique ({stats['ratio']}x)")
+    print(f"all: {report['entries']} entries, {report['unique']} unique ({report['ratio']}x), "
+          f"{report['shared_across_locales']} shared by several locales")
+    print(f"chars: {report['chars_total']} total, {report['chars_unique']} unique")
+    if "memory" in report:
+        memory = report["memory"]
+        print(f"memory: {memory['plain_bytes']} bytes as dicts, {memory['interned_bytes']} interned")
+    for entry in report["top"]:
+        text = entry["text"] if len(entry["text"]) <= 60 else entry["text"][:57] + "..."
+        print(f"{entry['count']:5d}  {entry['locales']:2d} locales  {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""RFC 6902 JSON Patch for message catalogs.
+
+diff() computes a minimal add/remove/replace patch between two catalogs,
+descending into nested namespaces so only changed leaves are touched.
+apply_patch() implements all six RFC 6902 operations. Patch files are
+stored as {"<locale>": [op, ...]} and replayed through CatalogTransaction,
+so a patch set lands on every locale or on none.
+
+    python -m tools.jsonpatch diff --from-snapshot before-update -o update.patch.json
+    python -m tools.jsonpatch diff --from-dir /path/to/old/messages -o update.patch.json
+    python -m tools.jsonpatch apply update.patch.json
+"""
+import argparse
+import copy
+import json
+import sys
+
+from tools.atomic import CatalogTransaction
+from tools.catalog import MESSAGES_DIR, available_locales, load_catalog
+
+
+class JsonPatchError(Exception):
+    pass
+
+
+def escape(token):
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def pointer(*tokens):
+    return "".join(f"/{escape(str(token))}" for token in tokens)
+
+
+def pointer_from_dotted(path):
+    """"guide.android.title" -> "/guide/android/title"."""
+    return pointer(*path.split("."))
+
+
+def parse_pointer(ptr):
+    if ptr == "":
+        return []
+    if not ptr.startswith("/"):
+        raise JsonPatchError(f"invalid JSON pointer: {ptr!r}")
+    return [unescape(token) for token in ptr[1:].split("/")]
+
+
+def diff(old, new, prefix=""):
+    """Minimal list of ops turning `old` into `new`; dicts are diffed per key.
+
+    An object add always lands at the end, so once `new`'s key order departs
+    from `old`'s, every later key is added or moved onto itself (a remove
+    and re-add) in `new`'s order. Replaying the patch reproduces the key
+    order exactly, and patches that only touch values or append keys stay
+    minimal.
+    """
+    if old is new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{prefix}/{escape(key)}"})
+        kept = [key for key in old if key in new]
+        in_order = 0
+        for key in new:
+            if in_order < len(kept) and kept[in_order] == key:
+                in_order += 1
+            else:
+                break
+        for i, (key, value) in enumerate(new.items()):
+            path = f"{prefix}/{escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": path, "value": value})
+                continue
+            ops.extend(diff(old[key], value, path))
+            if i >= in_order:
+                ops.append({"op": "move", "from": path, "path": path})
+        return ops
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": prefix, "value": new}]
+
+
+def _resolve(doc, tokens):
+    node = doc
+    for token in tokens:
+        if isinstance(node, dict):
+            if token not in node:
+                raise JsonPatchError(f"path not found: {pointer(*tokens)}")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token)]
+        else:
+            raise JsonPatchError(f"path not found: {pointer(*tokens)}")
+    return node
+
+
+def _index(array, token, allow_end=False):
+    if token == "-" and allow_end:
+        return len(array)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise JsonPatchError(f"invalid array index: {token!r}")
+    index = int(token)
+    if index > len(array) or (index == len(array) and not allow_end):
+        raise JsonPatchError(f"array index out of range: {index}")
+    return index
+
+
+def _add(doc, tokens, value):
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    if isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], allow_end=True), value)
+    else:
+        raise JsonPatchError(f"cannot add to {pointer(*tokens[:-1])}")
+    return doc
+
+
+def _remove(doc, tokens):
+    if not tokens:
+        raise JsonPatchError("cannot remove the document root")
+    parent = _resolve(doc, tokens[:-1])
+    if isinstance(parent, dict):
+        if tokens[-1] not in parent:
+            raise JsonPatchError(f"path not found: {pointer(*tokens)}")
+        return parent.pop(tokens[-1])
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, tokens[-1]))
+    raise JsonPatchError(f"path not found: {pointer(*tokens)}")
+
+
+def apply_patch(doc, ops, in_place=False):
+    """Apply RFC 6902 ops to doc and return the result.
+
+    Raises JsonPatchError on the first failing op; unless in_place is set the
+    input document is left untouched either way.
+    """
+    if not in_place:
+        doc = copy.deepcopy(doc)
+    for op in ops:
+        kind = op.get("op")
+        tokens = parse_pointer(op.get("path", ""))
+        if kind == "add":
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+        elif kind == "remove":
+            _remove(doc, tokens)
+        elif kind == "replace":
+            _resolve(doc, tokens)
+            value = copy.deepcopy(op["value"])
+            if not tokens:
+                doc = value
+            else:
+                parent = _resolve(doc, tokens[:-1])
+                key = tokens[-1] if isinstance(parent, dict) else _index(parent, tokens[-1])
+                parent[key] = value
+        elif kind in ("move", "copy"):
+            source = parse_pointer(op["from"])
+            if kind == "move" and tokens[:len(source)] == source and tokens != source:
+                raise JsonPatchError(f"cannot move {op['from']} into itself")
+            value = _remove(doc, source) if kind == "move" else copy.deepcopy(_resolve(doc, source))
+            doc = _add(doc, tokens, value)
+        elif kind == "test":
+            if _resolve(doc, tokens) != op["value"]:
+                raise JsonPatchError(f"test failed at {op['path']}")
+        else:
+            raise JsonPatchError(f"unknown op: {kind!r}")
+    return doc
+
+
+def diff_catalogs(old_catalogs, new_catalogs):
+    """{locale: ops} for every locale whose catalog differs."""
+    patches = {}
+    for locale in sorted(set(old_catalogs) | set(new_catalogs)):
+        ops = diff(old_catalogs.get(locale, {}), new_catalogs.get(locale, {}))
+        if ops:
+            patches[locale] = ops
+    return patches
+
+
+def apply_patches(patches, messages_dir=MESSAGES_DIR):
+    """Apply a stored {locale: ops} patch set to messages/ atomically."""
+    with CatalogTransaction(messages_dir) as txn:
+        for locale, ops in patches.items():
+            try:
+                data = txn.load(locale)
+            except FileNotFoundError:
+                data = {}
+            txn.stage(locale, apply_patch(data, ops, in_place=True))
+            print(f"OK: {locale} ({len(ops)} ops)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages-dir", default=MESSAGES_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    emit = sub.add_parser("diff", help="patch from an older catalog set to the current messages/")
+    source = emit.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-dir", help="messages directory holding the old catalogs")
+    source.add_argument("--from-snapshot", help="snapshot name in the tools.snapshots store")
+    emit.add_argument("-o", "--output", help="write the patch set here instead of stdout")
+    replay = sub.add_parser("apply", help="apply a stored patch set to messages/")
+    replay.add_argument("patch")
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        if args.from_dir:
+            old = {locale: load_catalog(locale, args.from_dir) for locale in available_locales(args.from_dir)}
+        else:
+            from tools.snapshots import SnapshotStore
+            store = SnapshotStore()
+            old = {locale: store.get_tree(root) for locale, root in store.roots(args.from_snapshot).items()}
+        new = {locale: load_catalog(locale, args.messages_dir) for locale in available_locales(args.messages_dir)}
+        patches = diff_catalogs(old, new)
+        raw = json.dumps(patches, ensure_ascii=False, indent=2) + "\n"
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(raw)
+            print(f"{sum(map(len, patches.values()))} op(s) across {len(patches)} locale(s)")
+        else:
+            sys.stdout.write(raw)
+    else:
+        with open(args.patch, "r", encoding="utf-8") as f:
+            apply_patches(json.load(f), args.messages_dir)
+
+
+if __name__ == "__main__":
+    main()
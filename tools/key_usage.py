@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Find message keys the app never references, and keys it references but en lacks.
+
+Every src/**/*.ts(x) file is scanned for translator bindings
+(``const t = useTranslations("ns")``, ``await getTranslations({ namespace:
+"ns" })``) and calls on them (``t("key")``, ``t.rich``, ``t.raw``, ...).
+A call is resolved against the nearest preceding binding of the same name,
+or the nearest following one for helpers declared above the component that
+receive the translator as a prop. Keys built from template literals
+(``t(`items.${key}.title`)``) become wildcard patterns and a non-literal
+key marks its whole namespace as used. Calls on ``t`` in files without a
+binding are matched against any namespace; such a call with a computed key
+cannot be resolved at all and is reported as unresolved.
+
+A regex scan can still miss a key (a translator passed through props
+under another name, a key assembled far from the call), so keys matching
+a pattern in tools/key_usage_keep.json are always treated as used.
+
+Files are scanned in parallel and the per-file results are cached in
+.cache/tools/key_usage.json by content digest.
+
+--prune removes unused keys from the compiled bundles in
+src/i18n/compiled/ (run `python -m tools.icu` first); messages/*.json are
+never modified. It is an explicit step, not part of the build: it refuses
+to prune, and exits 2, while any call is unresolved or references a key en
+lacks. Pruned bundles are what src/i18n/request.ts serves in production,
+and the layout's getMessages() hands the same tree to
+NextIntlClientProvider, so a wrongly pruned key renders as its raw name
+on both server and client.
+
+    python -m tools.key_usage
+    python -m tools.key_usage --json
+    python -m tools.key_usage --prune
+"""
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.catalog import DEFAULT_LOCALE, REPO_ROOT, cache_path, file_digest, flatten, load_flat_catalog, unflatten
+
+SOURCE_GLOBS = ["src/**/*.ts", "src/**/*.tsx"]
+CACHE_FILE = "key_usage.json"
+FORMAT_VERSION = 2
+KEEP_FILE = os.path.join(REPO_ROOT, "tools", "key_usage_keep.json")
+
+ANY_NAMESPACE = "*"
+
+_BINDING = re.compile(
+    r"\b(?:const|let|var)\s+(\w+)\s*=\s*(?:await\s+)?(useTranslations|getTranslations)\s*\(\s*"
+    r"(?:([\"'])([\w.]*)\3|\{[^}]*?\bnamespace\s*:\s*([\"'])([\w.]*)\5[^}]*\}|\{[^}]*\})?\s*\)"
+)
+_CALL = r"(?<![\w.$]){name}(?:\.(?:raw|rich|markup|has))?\s*\(\s*"
+_LITERAL = re.compile(r"([\"'])((?:\\.|(?!\1).)*)\1|`((?:\\.|[^`\\])*)`")
+
+
+def _key_pattern(text, pos):
+    """Return (pattern, exact) for the first call argument starting at pos."""
+    match = _LITERAL.match(text, pos)
+    if not match or text[match.end():].lstrip()[:1] not in (")", ","):
+        return "*", False
+    if match.group(3) is None:
+        return match.group(2), True
+    key = re.sub(r"\$\{[^}]*\}", "*", match.group(3))
+    return key, "*" not in key
+
+
+def scan_source(text):
+    """[(namespace, pattern, exact, line)] for every translator call in a file."""
+    bindings = [(m.start(), m.group(1), m.group(4) or m.group(6) or "") for m in _BINDING.finditer(text)]
+    names = {name for _, name, _ in bindings} | {"t"}
+    binding_spans = {m.start(): m.end() for m in _BINDING.finditer(text)}
+    refs = []
+    for name in sorted(names):
+        for call in re.finditer(_CALL.format(name=re.escape(name)), text):
+            if any(start <= call.start() < end for start, end in binding_spans.items()):
+                continue
+            own = [(pos, ns) for pos, bound, ns in bindings if bound == name]
+            before = [ns for pos, ns in own if pos < call.start()]
+            after = [ns for pos, ns in own if pos > call.start()]
+            namespace = before[-1] if before else after[0] if after else ANY_NAMESPACE
+            pattern, exact = _key_pattern(text, call.end())
+            line = text.count("\n", 0, call.start()) + 1
+            refs.append((namespace, pattern, exact, line))
+    return refs
+
+
+def _scan_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return path, scan_source(f.read())
+
+
+def load_keep_patterns(path=KEEP_FILE):
+    """Glob patterns of keys that are never reported unused."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["keep"]
+
+
+def _load_cache():
+    try:
+        with open(cache_path(CACHE_FILE), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == FORMAT_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": FORMAT_VERSION, "files": {}}
+
+
+def _save_cache(cache):
+    path = cache_path(CACHE_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp, path)
+
+
+def scan(root=REPO_ROOT, jobs=None):
+    """{relative path: refs} for every source file, rescanning only changed files."""
+    paths = sorted({p for pattern in SOURCE_GLOBS for p in glob.glob(os.path.join(root, pattern), recursive=True)})
+    cache = _load_cache()
+    results, stale, digests = {}, [], {}
+    for path in paths:
+        rel = os.path.relpath(path, root)
+        digests[rel] = file_digest(path)
+        entry = cache["files"].get(rel)
+        if entry and entry["digest"] == digests[rel]:
+            results[rel] = [tuple(ref) for ref in entry["refs"]]
+        else:
+            stale.append(path)
+    if stale:
+        if len(stale) > 8 and jobs != 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                scanned = list(pool.map(_scan_file, stale, chunksize=8))
+        else:
+            scanned = [_scan_file(path) for path in stale]
+        for path, refs in scanned:
+            rel = os.path.relpath(path, root)
+            results[rel] = refs
+            cache["files"][rel] = {"digest": digests[rel], "refs": refs}
+    cache["files"] = {rel: cache["files"][rel] for rel in results}
+    _save_cache(cache)
+    return results
+
+
+def _full_pattern(namespace, pattern):
+    if namespace == ANY_NAMESPACE:
+        return "*." + pattern if pattern != "*" else None
+    return f"{namespace}.{pattern}" if namespace else pattern
+
+
+def analyse(results, keys, keep=()):
+    """Return (used, unused, undefined, unresolved) for the flat en key list."""
+    used, undefined, unresolved = set(), [], []
+    exact_keys = set(keys)
+    for pattern in keep:
+        used.update(fnmatch.filter(keys, pattern))
+    for rel, refs in sorted(results.items()):
+        for namespace, pattern, exact, line in refs:
+            full = _full_pattern(namespace, pattern)
+            if full is None:
+                unresolved.append(f"{rel}:{line}")
+                continue
+            if exact and namespace != ANY_NAMESPACE:
+                hits = [full] if full in exact_keys else [k for k in keys if k.startswith(full + ".")]
+            else:
+                hits = fnmatch.filter(keys, full)
+            used.update(hits)
+            if not hits and namespace != ANY_NAMESPACE:
+                undefined.append((f"{rel}:{line}", full))
+    unused = [key for key in keys if key not in used]
+    return used, unused, undefined, unresolved
+
+
+def prune_bundles(unused, compiled_dir):
+    """Drop unused keys from every compiled bundle; return {locale: bytes saved}."""
+    unused = set(unused)
+    saved = {}
+    for path in sorted(glob.glob(os.path.join(compiled_dir, "*.json"))):
+        name = os.path.basename(path)
+        if name == "fallback.json":
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        before = os.path.getsize(path)
+        data = unflatten({key: value for key, value in flatten(data).items() if key not in unused})
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+        saved[name[:-len(".json")]] = before - os.path.getsize(path)
+    return saved
+
+
+def main():
+    from tools.icu import COMPILED_DIR
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, help="scanner processes (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--prune", action="store_true", help="remove unused keys from the compiled bundles")
+    parser.add_argument("--compiled-dir", default=COMPILED_DIR)
+    args = parser.parse_args()
+
+    keys = list(load_flat_catalog(DEFAULT_LOCALE))
+    results = scan(jobs=args.jobs)
+    used, unused, undefined, unresolved = analyse(results, keys, load_keep_patterns())
+    if args.json:
+        print(json.dumps({"used": len(used), "unused": unused,
+                          "undefined": [{"location": loc, "key": key} for loc, key in undefined],
+                          "unresolved": unresolved},
+                         ensure_ascii=False, indent=2))
+    else:
+        for key in unused:
+            print(f"unused: {key}")
+        for location, key in undefined:
+            print(f"undefined: {key} ({location})")
+        for location in unresolved:
+            print(f"unresolved: computed key on an unbound translator ({location})")
+        print(f"{len(used)} used, {len(unused)} unused, {len(undefined)} undefined, "
+              f"{len(unresolved)} unresolved of {len(keys)} keys")
+    if args.prune:
+        if undefined or unresolved:
+            print("not pruning: resolve the calls above or add their keys to tools/key_usage_keep.json",
+                  file=sys.stderr)
+            sys.exit(2)
+        if not os.path.isdir(args.compiled_dir):
+            sys.exit(f"{args.compiled_dir} not found; run `python -m tools.icu` first")
+        for name, saved in prune_bundles(unused, args.compiled_dir).items():
+            print(f"pruned: {name} (-{saved} bytes)")
+    sys.exit(1 if undefined or unresolved else 0)
+
+
+if __name__ == "__main__":
+    main()
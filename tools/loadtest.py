@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""Load-test /api/vpn/connect and /api/vpn/servers against a local stub backend.
+
+Two subcommands, standard library only:
+
+stub
+    A threaded HTTP server standing in for the VPN node APIs: the Marzban
+    endpoints used by src/lib/marzban.ts (POST .../admin/token, /system,
+    /users, /user[/<name>]) and the WireGuard API that /api/vpn/connect calls
+    (POST /create, POST /delete, authenticated with x-api-key). Latency,
+    jitter and error rate are tunable. Point vpn_servers.marzban_api_url and
+    config_data.wg_api_url of a test server row at it.
+
+run
+    Drives a running app (``next start``) with a weighted request mix from
+    a pool of worker threads, then reports throughput, error counts and
+    p50/p95/p99 latency per endpoint. --with-stub starts the stub in-process.
+
+    python -m tools.loadtest stub --port 9100 --latency-ms 40 --error-rate 0.01
+    python -m tools.loadtest run --target http://localhost:3000 \\
+        --mix connect=1,servers=4 --concurrency 32 --duration 30 \\
+        --account VPN-AAAA-BBBB-CCCC --server-id <vpn_servers.id>
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_TOKEN = "stub-access-token"
+
+
+# -- stub backend -----------------------------------------------------------
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    api_key = "stub-key"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _reply(self, status, body=None):
+        raw = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _simulate(self):
+        """Sleep for the configured latency; return True if this request should fail."""
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        return random.random() < self.error_rate
+
+    def _handle(self, method):
+        self._read_body()
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if self._simulate():
+            return self._reply(500, {"detail": "stub injected failure"})
+
+        # WireGuard API used by /api/vpn/connect
+        if path.endswith("/create") or path.endswith("/delete"):
+            if self.headers.get("x-api-key") != self.api_key:
+                return self._reply(401, {"detail": "invalid api key"})
+            if path.endswith("/delete"):
+                return self._reply(200, {"status": "ok"})
+            n = random.randint(2, 250)
+            return self._reply(200, {
+                "private_key": uuid.uuid4().hex, "public_key": uuid.uuid4().hex,
+                "client_ip": f"10.8.0.{n}", "server_pubkey": "stub-server-pubkey",
+                "endpoint": "127.0.0.1:51820", "dns": "1.1.1.1",
+            })
+
+        # Marzban API used by src/lib/marzban.ts
+        if path.endswith("/admin/token") and method == "POST":
+            return self._reply(200, {"access_token": STUB_TOKEN, "token_type": "bearer"})
+        if self.headers.get("Authorization") != f"Bearer {STUB_TOKEN}":
+            return self._reply(401, {"detail": "Not authenticated"})
+        if path.endswith("/system"):
+            return self._reply(200, {"version": "stub", "total_user": 0, "users_active": 0})
+        if path.endswith("/users"):
+            return self._reply(200, {"users": [], "total": 0})
+        if "/user" in path:
+            username = path.rsplit("/user", 1)[1].lstrip("/") or uuid.uuid4().hex[:8]
+            if method == "DELETE":
+                return self._reply(200, {"detail": "User successfully deleted"})
+            return self._reply(200, {"username": username, "status": "active",
+                                     "links": [f"vless://{uuid.uuid4()}@127.0.0.1:443"]})
+        return self._reply(404, {"detail": "Not Found"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def start_stub(port, latency_ms=0, jitter_ms=0, error_rate=0.0, api_key="stub-key"):
+    """Start the stub on a background thread and return the server."""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {
+        "latency": latency_ms / 1000, "jitter": jitter_ms / 1000,
+        "error_rate": error_rate, "api_key": api_key,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# -- load generator ---------------------------------------------------------
+
+def build_requests(target, accounts, server_ids):
+    """{name: factory() -> urllib Request} for the endpoints in the mix."""
+    def connect():
+        body = json.dumps({
+            "account_id": random.choice(accounts),
+            "server_id": random.choice(server_ids),
+            "device_id": f"loadtest-{uuid.uuid4().hex[:12]}",
+        }).encode()
+        return urllib.request.Request(f"{target}/api/vpn/connect", data=body, method="POST",
+                                      headers={"Content-Type": "application/json"})
+
+    def servers():
+        return urllib.request.Request(f"{target}/api/vpn/servers")
+
+    return {"connect": connect, "servers": servers}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def run_load(factories, mix, concurrency, duration=None, total=None, timeout=15.0):
+    """Fire requests until `duration` seconds pass or `total` requests are sent.
+
+    Returns ({name: [(latency_s, status)]}, elapsed_s).
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    results = {name: [] for name in names}
+    lock = threading.Lock()
+    sent = [0]
+    deadline = time.monotonic() + duration if duration else None
+
+    def next_request():
+        with lock:
+            if total is not None and sent[0] >= total:
+                return None
+            sent[0] += 1
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        return random.choices(names, weights)[0]
+
+    def worker():
+        while True:
+            name = next_request()
+            if name is None:
+                return
+            request = factories[name]()
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                e.read()
+                status = e.code
+            except (urllib.error.URLError, OSError):
+                status = 0
+            elapsed = time.perf_counter() - start
+            with lock:
+                results[name].append((elapsed, status))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    return results, time.perf_counter() - started
+
+
+def summarize(results, elapsed):
+    rows = []
+    everything = []
+    for name, samples in list(results.items()) + [("all", None)]:
+        samples = everything if samples is None else samples
+        if name != "all":
+            everything.extend(samples)
+        latencies = sorted(latency for latency, _ in samples)
+        statuses = {}
+        for _, status in samples:
+            statuses[status] = statuses.get(status, 0) + 1
+        errors = sum(count for status, count in statuses.items() if not 200 <= status < 300)
+        rows.append({
+            "endpoint": name, "requests": len(samples), "errors": errors,
+            "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    stub = sub.add_parser("stub", help="run the stub Marzban/WireGuard backend")
+    run = sub.add_parser("run", help="generate load against a running app")
+    for p in (stub, run):
+        p.add_argument("--stub-port", "--port", dest="port", type=int, default=9100)
+        p.add_argument("--latency-ms", type=float, default=30)
+        p.add_argument("--jitter-ms", type=float, default=10)
+        p.add_argument("--error-rate", type=float, default=0.0)
+        p.add_argument("--api-key", default="stub-key", help="x-api-key the stub WireGuard API expects")
+    run.add_argument("--target", default="http://localhost:3000")
+    run.add_argument("--mix", default="connect=1,servers=4", help="weighted endpoints, e.g. connect=1,servers=4")
+    run.add_argument("--concurrency", type=int, default=16)
+    run.add_argument("--duration", type=float, default=30, help="seconds (ignored with --requests)")
+    run.add_argument("--requests", type=int, help="stop after this many requests")
+    run.add_argument("--account", action="append", default=[], help="account id/code to connect with (repeatable)")
+    run.add_argument("--server-id", action="append", default=[], help="vpn_servers.id to connect to (repeatable)")
+    run.add_argument("--with-stub", action="store_true", help="also start the stub backend in-process")
+    run.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    if args.command == "stub":
+        server = start_stub(args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.api_key)
+        print(f"Stub backend listening on http://127.0.0.1:{args.port} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    mix = parse_mix(args.mix)
+    if "connect" in mix and (not args.account or not args.server_id):
+        parser.error("the connect endpoint needs at least one --account and --server-id")
+    stub_server = None
+    if args.with_stub:
+        stub_server = start_stub(args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.api_key)
+    factories = build_requests(args.target.rstrip("/"), args.account, args.server_id)
+    unknown = set(mix) - set(factories)
+    if unknown:
+        parser.error(f"unknown endpoint(s) in --mix: {', '.join(sorted(unknown))}")
+    try:
+        results, elapsed = run_load(factories, mix, args.concurrency,
+                                    None if args.requests else args.duration, args.requests)
+    finally:
+        if stub_server:
+            stub_server.shutdown()
+
+    rows = summarize(results, elapsed)
+    if args.json:
+        print(json.dumps({"elapsed_s": round(elapsed, 2), "endpoints": rows}, indent=2))
+        return
+    print(f"{'endpoint':10} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for row in rows:
+        print(f"{row['endpoint']:10} {row['requests']:8} {row['errors']:6} {row['rps']:8} "
+              f"{row['p50_ms']:8} {row['p95_ms']:8} {row['p99_ms']:8}")
+
+
+if __name__ == "__main__":
+    main()
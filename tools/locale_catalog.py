@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Lazy, memory-bounded access to many locales' catalogs.
+
+LocaleCatalog lists the locales of a messages directory without reading
+them. A locale is loaded on first access and kept in an LRU; once the
+estimated size of the loaded locales exceeds max_bytes (or their number
+exceeds max_locales), the least recently used ones are dropped and
+reloaded on their next access. Views returned by catalog[locale] and
+view[namespace] hold a path, not the data, so they stay valid across
+evictions.
+
+    catalog = LocaleCatalog()
+    catalog["fr"]["hero"]["tagline"]
+    catalog["fr"].get("guide.android.step2Desc")
+    for locale in catalog:
+        print(locale, len(catalog[locale].flat()))
+
+The same interface works over the `translations` literal of a translation
+script (LocaleCatalog.from_translations_module("apply_translations.py")).
+
+    python -m tools.locale_catalog stats --max-bytes 1000000
+"""
+import argparse
+import os
+import sys
+from collections import OrderedDict
+
+from tools.catalog import MESSAGES_DIR, available_locales, flatten, load_catalog
+
+MAX_BYTES = int(os.environ.get("DOPPLER_TOOLS_CATALOG_MAX_BYTES", 32 << 20))
+
+
+def estimate_size(value):
+    """Rough in-memory size of a nested dict of strings."""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(k) + estimate_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class LocaleCatalog:
+    def __init__(self, messages_dir=MESSAGES_DIR, max_bytes=MAX_BYTES, max_locales=None,
+                 locales=None, loader=None):
+        self.messages_dir = messages_dir
+        self.max_bytes = max_bytes
+        self.max_locales = max_locales
+        self._locales = locales
+        self._loader = loader or (lambda locale: load_catalog(locale, self.messages_dir))
+        self._loaded = OrderedDict()  # locale -> (data, size)
+        self._bytes = 0
+        self.stats = {"loads": 0, "hits": 0, "evictions": 0}
+
+    @classmethod
+    def from_translations_module(cls, path, **kwargs):
+        from tools.catalog_cache import load_translations_locale, translations_module_locales
+
+        locales = translations_module_locales(path)
+        return cls(locales=locales, loader=lambda locale: load_translations_locale(path, locale), **kwargs)
+
+    @property
+    def locales(self):
+        if self._locales is None:
+            self._locales = available_locales(self.messages_dir)
+        return self._locales
+
+    def __iter__(self):
+        return iter(self.locales)
+
+    def __len__(self):
+        return len(self.locales)
+
+    def __contains__(self, locale):
+        return locale in self.locales
+
+    def __getitem__(self, locale):
+        if locale not in self.locales:
+            raise KeyError(locale)
+        return NamespaceView(self, locale, ())
+
+    @property
+    def loaded(self):
+        """Locales currently in memory, least recently used first."""
+        return list(self._loaded)
+
+    @property
+    def loaded_bytes(self):
+        return self._bytes
+
+    def data(self, locale):
+        """The locale's nested dict, loading it (and evicting others) if needed."""
+        entry = self._loaded.get(locale)
+        if entry is not None:
+            self._loaded.move_to_end(locale)
+            self.stats["hits"] += 1
+            return entry[0]
+        data = self._loader(locale)
+        size = estimate_size(data)
+        self.stats["loads"] += 1
+        self._loaded[locale] = (data, size)
+        self._bytes += size
+        self._evict(keep=locale)
+        return data
+
+    def _evict(self, keep):
+        while len(self._loaded) > 1 and (
+            self._bytes > self.max_bytes or (self.max_locales and len(self._loaded) > self.max_locales)
+        ):
+            locale = next(iter(self._loaded))
+            if locale == keep:
+                break
+            _, size = self._loaded.pop(locale)
+            self._bytes -= size
+            self.stats["evictions"] += 1
+
+    def evict(self, locale=None):
+        """Drop one locale, or all of them, from memory."""
+        for name in [locale] if locale else list(self._loaded):
+            entry = self._loaded.pop(name, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+
+class NamespaceView:
+    """A locale or a namespace inside it, resolved against the catalog on each access."""
+
+    def __init__(self, catalog, locale, path):
+        self.catalog = catalog
+        self.locale = locale
+        self.path = path
+
+    def _node(self):
+        node = self.catalog.data(self.locale)
+        for part in self.path:
+            node = node[part]
+        return node
+
+    def __getitem__(self, key):
+        value = self._node()[key]
+        return NamespaceView(self.catalog, self.locale, self.path + (key,)) if isinstance(value, dict) else value
+
+    def __contains__(self, key):
+        return key in self._node()
+
+    def __iter__(self):
+        return iter(list(self._node()))
+
+    def __len__(self):
+        return len(self._node())
+
+    def keys(self):
+        return list(self._node())
+
+    def get(self, dotted, default=None):
+        """Look up a dotted key relative to this view."""
+        node = self._node()
+        for part in dotted.split("."):
+            if not isinstance(node, dict) or part not in node:
+                return default
+            node = node[part]
+        return node
+
+    def namespaces(self):
+        return [key for key, value in self._node().items() if isinstance(value, dict)]
+
+    def flat(self):
+        return flatten(self._node(), ".".join(self.path))
+
+    def to_dict(self):
+        return self._node()
+
+    def __repr__(self):
+        return f"<NamespaceView {self.locale}:{'.'.join(self.path) or '*'}>"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["stats"])
+    parser.add_argument("--messages-dir", default=MESSAGES_DIR)
+    parser.add_argument("--max-bytes", type=int, default=MAX_BYTES)
+    parser.add_argument("--max-locales", type=int)
+    args = parser.parse_args()
+
+    catalog = LocaleCatalog(args.messages_dir, args.max_bytes, args.max_locales)
+    peak = 0
+    for locale in catalog:
+        keys = len(catalog[locale].flat())
+        peak = max(peak, catalog.loaded_bytes)
+        print(f"{locale}: {keys} keys, {len(catalog.loaded)} loaded, {catalog.loaded_bytes} bytes")
+    print(f"peak {peak} bytes, {catalog.stats['loads']} loads, {catalog.stats['evictions']} evictions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Key-aware three-way merge driver for messages/*.json.
+
+Registered for messages/*.json in .gitattributes as the "catalog" merge
+driver; enable it once per clone with
+
+    python -m tools.merge_catalogs install
+
+Git then calls ``python3 -m tools.merge_catalogs %O %A %B %P``. Subtrees that
+are identical on two sides are taken whole without being walked, so the work
+is proportional to what changed rather than to the file size. A conflict is
+only raised when the same dotted key changed differently on both sides; the
+merged file keeps our value for it, the conflicting keys are listed on
+stderr, and the driver exits non-zero so git marks the file as conflicted.
+"""
+import json
+import subprocess
+import sys
+
+from tools.catalog import dump_catalog
+
+MISSING = object()
+
+
+def merge(base, ours, theirs, path="", conflicts=None):
+    """Three-way merge of two catalog nodes; MISSING stands for an absent key.
+
+    Returns the merged node (possibly MISSING) and appends conflicting
+    dotted paths to `conflicts`.
+    """
+    if conflicts is None:
+        conflicts = []
+    if ours == theirs:
+        return ours
+    if ours == base:
+        return theirs
+    if theirs == base:
+        return ours
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        base_dict = base if isinstance(base, dict) else {}
+        merged = {}
+        keys = list(ours) + [key for key in theirs if key not in ours]
+        for key in keys:
+            value = merge(
+                base_dict.get(key, MISSING), ours.get(key, MISSING), theirs.get(key, MISSING),
+                f"{path}.{key}" if path else key, conflicts,
+            )
+            if value is not MISSING:
+                merged[key] = value
+        return merged
+    conflicts.append((path, ours, theirs))
+    return ours if ours is not MISSING else theirs
+
+
+def _load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return json.loads(text) if text.strip() else {}
+
+
+def _show(value):
+    return "<deleted>" if value is MISSING else json.dumps(value, ensure_ascii=False)
+
+
+def install():
+    subprocess.run(["git", "config", "merge.catalog.name", "messages catalog key-level merge"], check=True)
+    subprocess.run(["git", "config", "merge.catalog.driver", "python3 -m tools.merge_catalogs %O %A %B %P"], check=True)
+    print("Installed merge.catalog driver")
+
+
+def main():
+    if sys.argv[1:] == ["install"]:
+        install()
+        return
+    if len(sys.argv) < 4:
+        sys.exit("usage: python -m tools.merge_catalogs BASE OURS THEIRS [PATH] | install")
+    base_path, ours_path, theirs_path = sys.argv[1:4]
+    name = sys.argv[4] if len(sys.argv) > 4 else ours_path
+    try:
+        base, ours, theirs = _load(base_path), _load(ours_path), _load(theirs_path)
+    except ValueError as e:
+        sys.exit(f"{name}: cannot merge, invalid JSON: {e}")
+
+    conflicts = []
+    merged = merge(base, ours, theirs, conflicts=conflicts)
+    with open(ours_path, "w", encoding="utf-8") as f:
+        f.write(dump_catalog(merged if merged is not MISSING else {}))
+    for path, ours_value, theirs_value in conflicts:
+        print(f"CONFLICT {name}: {path}: ours {_show(ours_value)} / theirs {_show(theirs_value)}", file=sys.stderr)
+    sys.exit(1 if conflicts else 0)
+
+
+if __name__ == "__main__":
+    main()
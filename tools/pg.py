@@ -0,0 +1,28 @@
+"""Postgres connections for the tools that talk to the database directly.
+
+psycopg 3 is preferred and psycopg2 is accepted; neither is needed by the
+rest of the tooling, so they are imported on first use. The DSN defaults to
+$SUPABASE_DB_URL, then $DATABASE_URL.
+"""
+import os
+
+
+def default_dsn():
+    return os.environ.get("SUPABASE_DB_URL") or os.environ.get("DATABASE_URL")
+
+
+def connect(dsn=None):
+    """Open a connection with autocommit off (one transaction until commit/rollback)."""
+    dsn = dsn or default_dsn()
+    if not dsn:
+        raise RuntimeError("no database DSN: pass one or set SUPABASE_DB_URL")
+    try:
+        import psycopg
+        return psycopg.connect(dsn, autocommit=False)
+    except ImportError:
+        pass
+    try:
+        import psycopg2
+        return psycopg2.connect(dsn)
+    except ImportError:
+        raise RuntimeError("psycopg or psycopg2 is required: pip install -r tools/requirements.txt")
@@ -0,0 +1,15 @@
+#!/bin/sh
+# Run by `npm run build` (the prebuild script). Every step has a fallback in
+# the app, so a machine without python3 or Supabase credentials still builds.
+set -e
+cd "$(dirname "$0")/.."
+
+if ! command -v python3 >/dev/null; then
+  echo "python3 not found: serving messages/ without ICU validation, the full font and src/app/sitemap.ts"
+  exit 0
+fi
+
+# Invalid ICU messages fail the build.
+python3 -m tools.icu
+python3 -m tools.font_subset || echo "font subsets skipped: serving the full font"
+python3 -m tools.sitemap || echo "sharded sitemaps skipped: serving src/app/sitemap.ts"
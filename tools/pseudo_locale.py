@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Generate pseudo-locales and synthetic catalogs from messages/en.json.
+
+Only the literal text of each message is transformed. Placeholders,
+plural/select branches and tags are parsed with tools.icu and written back
+unchanged, so the result still renders through next-intl. Transforms:
+
+    --expansion R   pad every message to (1 + R) times its length
+    --accents       swap ASCII letters for accented look-alikes
+    --rtl           wrap messages in RLO ... PDF, so Latin text lays out
+                    right-to-left the way he/fa/ar/ur pages do
+    --namespaces N --keys M
+                    append N synthetic namespaces of M generated messages
+
+Every message is wrapped in [ ] so truncation shows up on screen. Output is
+written as a stream of JSON fragments, so multi-megabyte catalogs never
+sit in memory. Presets cover the usual cases:
+
+    en-XA  accents, +30%        en-XL  accents, +100%
+    ar-XB  accents, +30%, RTL
+
+    python -m tools.pseudo_locale en-XA
+    python -m tools.pseudo_locale ar-XB --out /tmp/messages/ar-XB.json
+    python -m tools.pseudo_locale en-XL --namespaces 200 --keys 500 --out -
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+from tools.catalog import DEFAULT_LOCALE, cache_path, load_catalog
+from tools.icu import LITERAL, PLURAL, SELECT, TAG, format_ast, parse
+
+PRESETS = {
+    "en-XA": {"expansion": 0.3, "accents": True, "rtl": False},
+    "en-XL": {"expansion": 1.0, "accents": True, "rtl": False},
+    "ar-XB": {"expansion": 0.3, "accents": True, "rtl": True},
+}
+
+ACCENTS = str.maketrans(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "åƀçđéƒĝĥîĵķļɱñöþǫŕšţûṽŵẋýžÅƁÇĐÉƑĜĤÎĴĶĻṀÑÖÞǪŔŠŢÛṼŴẊÝŽ",
+)
+FILLER = "one two three four five six seven eight nine ten".split()
+RLO, PDF = "\u202e", "\u202c"
+
+
+class PseudoTransform:
+    def __init__(self, expansion=0.0, accents=False, rtl=False):
+        self.expansion = expansion
+        self.accents = accents
+        self.rtl = rtl
+
+    def _literals(self, nodes):
+        for node in nodes:
+            if node["type"] == LITERAL:
+                if self.accents:
+                    node["value"] = node["value"].translate(ACCENTS)
+            elif node["type"] == TAG:
+                self._literals(node["children"])
+            elif node["type"] in (SELECT, PLURAL):
+                for option in node["options"].values():
+                    self._literals(option["value"])
+
+    def _padding(self, length):
+        needed = int(length * self.expansion + 0.5)
+        words = []
+        while needed > 0:
+            word = FILLER[len(words) % len(FILLER)][:needed]
+            words.append(word)
+            needed -= len(word) + 1
+        text = " " + " ".join(words) if words else ""
+        return text.translate(ACCENTS) if self.accents else text
+
+    def __call__(self, text):
+        if any(char in text for char in "{}<>'"):
+            nodes = parse(text)
+            self._literals(nodes)
+            nodes = [{"type": LITERAL, "value": "["}] + nodes
+            nodes.append({"type": LITERAL, "value": self._padding(len(text)) + "]"})
+            result = format_ast(nodes)
+        else:
+            body = text.translate(ACCENTS) if self.accents else text
+            result = f"[{body}{self._padding(len(text))}]"
+        return f"{RLO}{result}{PDF}" if self.rtl else result
+
+
+def synthetic_namespaces(count, keys, seed=0):
+    """Yield (namespace, [(key, text)]) of generated English-like messages."""
+    rng = random.Random(seed)
+    for n in range(count):
+        entries = []
+        for k in range(keys):
+            words = [rng.choice(FILLER) for _ in range(rng.randint(2, 40))]
+            text = " ".join(words).capitalize()
+            if k % 10 == 0:
+                text += " {count}"
+            entries.append((f"message{k:05d}", text))
+        yield f"synthetic{n:04d}", entries
+
+
+def iter_json(items, indent=2, level=0):
+    """Yield JSON text for an iterable of (key, value) pairs, where value is a
+    string or another iterable of pairs. Nothing is materialized."""
+    pad = " " * indent * (level + 1)
+    yield "{"
+    first = True
+    for key, value in items:
+        yield ("\n" if first else ",\n") + pad + json.dumps(key, ensure_ascii=False) + ": "
+        first = False
+        if isinstance(value, str):
+            yield json.dumps(value, ensure_ascii=False)
+        else:
+            yield from iter_json(value, indent, level + 1)
+    yield ("" if first else "\n" + " " * indent * level) + "}"
+
+
+def _transformed(data, transform):
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield key, _transformed(value, transform)
+        else:
+            yield key, transform(value)
+
+
+def generate(transform, namespaces=0, keys=0, seed=0, source=DEFAULT_LOCALE):
+    """Yield (key, value) pairs for the whole pseudo catalog."""
+    yield from _transformed(load_catalog(source), transform)
+    for namespace, entries in synthetic_namespaces(namespaces, keys, seed):
+        yield namespace, ((key, transform(text)) for key, text in entries)
+
+
+def write(path, chunks):
+    """Stream chunks to path (atomically) or to stdout for "-"; return bytes written."""
+    if path == "-":
+        size = 0
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+            size += len(chunk.encode("utf-8"))
+        sys.stdout.write("\n")
+        return size
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", buffering=1 << 16) as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.write("\n")
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("name", help=f"output locale name; presets: {', '.join(PRESETS)}")
+    parser.add_argument("--expansion", type=float, help="extra length as a fraction (0.3 = +30%%)")
+    parser.add_argument("--accents", action=argparse.BooleanOptionalAction, default=None)
+    parser.add_argument("--rtl", action=argparse.BooleanOptionalAction, default=None)
+    parser.add_argument("--namespaces", type=int, default=0, help="synthetic namespaces to append")
+    parser.add_argument("--keys", type=int, default=100, help="messages per synthetic namespace")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="output file, or - for stdout (default: .cache/tools/pseudo/<name>.json)")
+    args = parser.parse_args()
+
+    options = dict(PRESETS.get(args.name, {"expansion": 0.0, "accents": False, "rtl": False}))
+    for option in ("expansion", "accents", "rtl"):
+        if getattr(args, option) is not None:
+            options[option] = getattr(args, option)
+    out = args.out or cache_path("pseudo", f"{args.name}.json")
+    chunks = iter_json(generate(PseudoTransform(**options), args.namespaces, args.keys, args.seed))
+    size = write(out, chunks)
+    if out != "-":
+        print(f"OK: {args.name} ({size} bytes) -> {out}")
+
+
+if __name__ == "__main__":
+    main()
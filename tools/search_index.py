@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Build static, sharded per-locale search indexes for the guides and blog.
+
+Documents are the guide pages (guide, guide/<device>, guide/protocols,
+guide/subscription, taken from the messages catalogs) and every published
+blog post translation. Text is tokenized per script: runs of Thai, CJK and
+Hangul become overlapping character bigrams (these scripts don't separate
+words with spaces), everything else is split into NFKC-casefolded words,
+with a light suffix stemmer for en.
+
+Output, per locale, under public/search/<locale>/:
+
+    docs.json        [[url, title], ...] indexed by doc number
+    manifest.json    {"shards": N, "hash": "fnv1a32", "docs": count}
+    <i>.json         {term: [doc, tf, doc, tf, ...]} for terms with
+                     fnv1a32(utf8(term)) % N == i
+
+The client tokenizes the query the same way and only fetches the shards its
+terms hash to.
+
+    python -m tools.search_index --blog
+    python -m tools.search_index query en "import config"
+"""
+import argparse
+import json
+import math
+import os
+import re
+import shutil
+import unicodedata
+from collections import Counter
+
+from tools.catalog import MESSAGES_DIR, REPO_ROOT, available_locales, flatten, load_catalog
+from tools.supabase_rest import load_blog_translations, load_rows
+
+OUTPUT_DIR = os.path.join(REPO_ROOT, "public", "search")
+SHARD_TARGET_BYTES = 16 * 1024
+GUIDE_DEVICES = ["android", "ios", "windows", "mac"]
+
+_SEGMENTED_RANGES = [
+    (0x0E00, 0x0E7F),    # Thai
+    (0x1100, 0x11FF),    # Hangul Jamo
+    (0x3040, 0x30FF),    # Hiragana, Katakana
+    (0x3400, 0x4DBF),    # CJK Extension A
+    (0x4E00, 0x9FFF),    # CJK Unified Ideographs
+    (0xAC00, 0xD7AF),    # Hangul Syllables
+    (0xF900, 0xFAFF),    # CJK Compatibility Ideographs
+]
+_SEGMENTED = "".join(f"{chr(lo)}-{chr(hi)}" for lo, hi in _SEGMENTED_RANGES)
+_RUN = re.compile(f"([{_SEGMENTED}]+)|([^\\W_]+)")
+_EN_SUFFIXES = ("ations", "ation", "ings", "ing", "ies", "ed", "es", "s")
+
+
+def stem_en(word):
+    for suffix in _EN_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "ies":
+                return word[:-3] + "y"
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text, locale):
+    """Index/query terms for text in the given locale."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    tokens = []
+    for match in _RUN.finditer(text):
+        segmented, word = match.groups()
+        if segmented:
+            if len(segmented) == 1:
+                tokens.append(segmented)
+            else:
+                tokens.extend(segmented[i:i + 2] for i in range(len(segmented) - 1))
+        elif locale == "en":
+            tokens.append(stem_en(word))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def fnv1a32(term):
+    h = 0x811C9DC5
+    for byte in term.encode("utf-8"):
+        h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def guide_documents(catalog, locale):
+    """(url, title, text) for each guide page of one locale."""
+    guide = catalog.get("guide", {})
+    overview = {k: v for k, v in guide.items() if k not in GUIDE_DEVICES}
+    if guide:
+        yield f"/{locale}/guide", guide.get("title", ""), " ".join(flatten(overview).values())
+    for device in GUIDE_DEVICES:
+        if isinstance(guide.get(device), dict):
+            section = guide[device]
+            yield f"/{locale}/guide/{device}", section.get("title", ""), " ".join(flatten(section).values())
+    for namespace, path in (("guideProtocols", "protocols"), ("guideSubscription", "subscription")):
+        section = catalog.get(namespace)
+        if section:
+            yield f"/{locale}/guide/{path}", section.get("title", ""), " ".join(flatten(section).values())
+
+
+def blog_documents(posts, translations):
+    """{locale: [(url, title, text)]} for published posts."""
+    slugs = {post["id"]: post["slug"] for post in posts if post.get("status") == "published"}
+    documents = {}
+    for row in translations:
+        slug = slugs.get(row["post_id"])
+        if slug is None:
+            continue
+        text = " ".join(row.get(field) or "" for field in ("title", "excerpt", "content"))
+        documents.setdefault(row["locale"], []).append((f"/{row['locale']}/blog/{slug}", row["title"], text))
+    return documents
+
+
+def build_locale(locale, documents, output_dir):
+    postings = {}
+    for doc, (_, _, text) in enumerate(documents):
+        for term, tf in Counter(tokenize(text, locale)).items():
+            postings.setdefault(term, []).extend((doc, tf))
+    approx_bytes = sum(len(term) + 4 * len(plist) for term, plist in postings.items())
+    shard_count = max(1, math.ceil(approx_bytes / SHARD_TARGET_BYTES))
+    shards = [{} for _ in range(shard_count)]
+    for term, plist in postings.items():
+        shards[fnv1a32(term) % shard_count][term] = plist
+
+    locale_dir = os.path.join(output_dir, locale)
+    shutil.rmtree(locale_dir, ignore_errors=True)
+    os.makedirs(locale_dir)
+    for i, shard in enumerate(shards):
+        _write_json(os.path.join(locale_dir, f"{i}.json"), shard)
+    _write_json(os.path.join(locale_dir, "docs.json"), [[url, title] for url, title, _ in documents])
+    _write_json(os.path.join(locale_dir, "manifest.json"),
+                {"shards": shard_count, "hash": "fnv1a32", "docs": len(documents)})
+    return shard_count
+
+
+def _write_json(path, value):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def search(locale, query, output_dir=OUTPUT_DIR, limit=10):
+    """Rank documents by summed tf-idf, reading only the shards the query needs."""
+    locale_dir = os.path.join(output_dir, locale)
+    with open(os.path.join(locale_dir, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    with open(os.path.join(locale_dir, "docs.json"), "r", encoding="utf-8") as f:
+        docs = json.load(f)
+    shards = {}
+    scores = Counter()
+    for term in set(tokenize(query, locale)):
+        index = fnv1a32(term) % manifest["shards"]
+        if index not in shards:
+            with open(os.path.join(locale_dir, f"{index}.json"), "r", encoding="utf-8") as f:
+                shards[index] = json.load(f)
+        plist = shards[index].get(term, [])
+        idf = math.log(1 + len(docs) / (len(plist) // 2 or 1))
+        for doc, tf in zip(plist[::2], plist[1::2]):
+            scores[doc] += tf * idf
+    return [(docs[doc][0], docs[doc][1], round(score, 3)) for doc, score in scores.most_common(limit)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages-dir", default=MESSAGES_DIR)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--blog", action="store_true", help="include published blog posts from Supabase")
+    parser.add_argument("--blog-posts-json", help="JSON export of blog_posts (id, slug, status)")
+    parser.add_argument("--blog-translations-json", help="JSON export of blog_post_translations")
+    sub = parser.add_subparsers(dest="command")
+    query = sub.add_parser("query", help="search a built index")
+    query.add_argument("locale")
+    query.add_argument("text")
+    args = parser.parse_args()
+
+    if args.command == "query":
+        for url, title, score in search(args.locale, args.text, args.output_dir):
+            print(f"{score:8} {url}  {title}")
+        return
+
+    blog = {}
+    if args.blog or args.blog_translations_json:
+        posts = load_rows("blog_posts", args.blog_posts_json, select="id,slug,status")
+        blog = blog_documents(posts, load_blog_translations(args.blog_translations_json))
+    for locale in available_locales(args.messages_dir):
+        documents = list(guide_documents(load_catalog(locale, args.messages_dir), locale))
+        documents.extend(blog.get(locale, []))
+        shard_count = build_locale(locale, documents, args.output_dir)
+        print(f"OK: {locale} ({len(documents)} docs, {shard_count} shard(s))")
+
+
+if __name__ == "__main__":
+    main()
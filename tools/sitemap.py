@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Precompute sharded sitemaps with hreflang alternates.
+
+Mirrors src/app/sitemap.ts, but runs ahead of time: static pages get
+alternates for every locale in LOCALES, while each published blog post only
+lists the locales that have a blog_post_translations row. Posts are ordered
+by (created_at, id) and chunked into shards of at most 50,000 URLs and
+50 MB uncompressed (with up to 22 alternates per URL the byte limit is the
+one that binds), so new posts only ever touch the last shard. A post's
+lastmod is the later of its own and its translations' updated_at. sitemap-state.json records a
+fingerprint per shard (slugs, post and translation updated_at, translated
+locales) and a shard file is only rewritten when its fingerprint changes.
+It runs in prebuild (tools/prebuild.sh). When the index exists, robots.ts
+lists /sitemaps/sitemap.xml and next.config.ts redirects /sitemap.xml to it;
+without Supabase credentials the step is skipped and src/app/sitemap.ts keeps
+serving the single sitemap.
+
+Output under public/sitemaps/:
+
+    sitemap.xml            sitemap index pointing at every shard
+    static.xml             the static pages
+    posts-<n>.xml          blog post shards
+
+    python -m tools.sitemap
+    python -m tools.sitemap --posts-json posts.json --translations-json translations.json
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+from xml.sax.saxutils import escape
+
+from tools.catalog import DEFAULT_LOCALE, LOCALES, REPO_ROOT
+from tools.supabase_rest import load_rows
+
+BASE_URL = "https://www.dopplervpn.org"
+OUTPUT_DIR = os.path.join(REPO_ROOT, "public", "sitemaps")
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+
+# (path, changefreq, priority), as in src/app/sitemap.ts
+STATIC_PAGES = [
+    ("", "weekly", 1),
+    ("/downloads", "monthly", 0.8),
+    ("/guide", "monthly", 0.7),
+    ("/privacy", "monthly", 0.5),
+    ("/terms", "monthly", 0.5),
+    ("/blog", "daily", 0.9),
+]
+
+_HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+           'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n')
+_FOOTER = "\n</urlset>\n"
+
+
+def url_entry(path, locales, lastmod, changefreq, priority):
+    default = DEFAULT_LOCALE if DEFAULT_LOCALE in locales else locales[0]
+    lines = [
+        "  <url>",
+        f"    <loc>{escape(f'{BASE_URL}/{default}{path}')}</loc>",
+        f"    <lastmod>{lastmod}</lastmod>",
+        f"    <changefreq>{changefreq}</changefreq>",
+        f"    <priority>{priority}</priority>",
+    ]
+    if len(locales) > 1:
+        for locale in locales:
+            href = escape(f"{BASE_URL}/{locale}{path}")
+            lines.append(f'    <xhtml:link rel="alternate" hreflang="{locale}" href="{href}"/>')
+        href = escape(f"{BASE_URL}/{default}{path}")
+        lines.append(f'    <xhtml:link rel="alternate" hreflang="x-default" href="{href}"/>')
+    lines.append("  </url>")
+    return "\n".join(lines)
+
+
+def collect_posts(posts, translations):
+    """Published posts in stable shard order, each with its translated locales."""
+    locales, touched = {}, {}
+    for row in translations:
+        locales.setdefault(row["post_id"], set()).add(row["locale"])
+        touched[row["post_id"]] = max(touched.get(row["post_id"], ""), row.get("updated_at") or "")
+    published = [post for post in posts if post.get("status") == "published" and locales.get(post["id"])]
+    published.sort(key=lambda post: (post.get("created_at") or "", post["id"]))
+    for post in published:
+        translated = locales[post["id"]]
+        post["locales"] = [locale for locale in LOCALES if locale in translated] + sorted(translated - set(LOCALES))
+        post["translations_updated_at"] = touched[post["id"]]
+    return published
+
+
+def fingerprint(posts):
+    h = hashlib.sha256()
+    for post in posts:
+        h.update(json.dumps([
+            post["id"], post["slug"], post["updated_at"], post["translations_updated_at"], post["locales"],
+        ]).encode())
+    return h.hexdigest()
+
+
+def _lastmod(timestamp):
+    return datetime.datetime.fromisoformat(timestamp.replace("Z", "+00:00")).date().isoformat()
+
+
+def post_lastmod(post):
+    """Date of the latest change to the post or any of its translations."""
+    return max(_lastmod(ts) for ts in (post["updated_at"], post["translations_updated_at"]) if ts)
+
+
+def post_shards(posts, max_urls=MAX_URLS, max_bytes=MAX_BYTES):
+    """Yield (posts, url entries) chunks that stay under both sitemap limits."""
+    budget = max_bytes - len(_HEADER.encode()) - len(_FOOTER.encode())
+    chunk, entries, size = [], [], 0
+    for post in posts:
+        entry = url_entry(f"/blog/{post['slug']}", post["locales"], post_lastmod(post), "weekly", 0.8)
+        entry_size = len(entry.encode("utf-8")) + 1
+        if chunk and (len(chunk) >= max_urls or size + entry_size > budget):
+            yield chunk, entries
+            chunk, entries, size = [], [], 0
+        chunk.append(post)
+        entries.append(entry)
+        size += entry_size
+    if chunk:
+        yield chunk, entries
+
+
+def _write(path, body):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+
+def build(posts, translations, output_dir=OUTPUT_DIR, max_urls=MAX_URLS, today=None, max_bytes=MAX_BYTES):
+    """Write changed shards and the index; return the list of rewritten files."""
+    today = today or datetime.date.today().isoformat()
+    os.makedirs(output_dir, exist_ok=True)
+    state_path = os.path.join(output_dir, "sitemap-state.json")
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    new_state, written, shards = {}, [], []
+
+    static_key = hashlib.sha256(json.dumps([STATIC_PAGES, LOCALES]).encode()).hexdigest()
+    static_lastmod = state.get("static.xml", {}).get("lastmod", today)
+    if (state.get("static.xml", {}).get("fingerprint") != static_key
+            or not os.path.exists(os.path.join(output_dir, "static.xml"))):
+        static_lastmod = today
+        body = "\n".join(url_entry(path, LOCALES, today, freq, prio) for path, freq, prio in STATIC_PAGES)
+        _write(os.path.join(output_dir, "static.xml"), f"{_HEADER}{body}{_FOOTER}")
+        written.append("static.xml")
+    new_state["static.xml"] = {"fingerprint": static_key, "lastmod": static_lastmod}
+    shards.append(("static.xml", static_lastmod))
+
+    ordered = collect_posts(posts, translations)
+    for n, (chunk, entries) in enumerate(post_shards(ordered, max_urls, max_bytes)):
+        name = f"posts-{n}.xml"
+        key = fingerprint(chunk)
+        lastmod = max(post_lastmod(post) for post in chunk)
+        if state.get(name, {}).get("fingerprint") != key or not os.path.exists(os.path.join(output_dir, name)):
+            body = "\n".join(entries)
+            _write(os.path.join(output_dir, name), f"{_HEADER}{body}{_FOOTER}")
+            written.append(name)
+        new_state[name] = {"fingerprint": key, "lastmod": lastmod}
+        shards.append((name, lastmod))
+
+    for name in set(state) - set(new_state):
+        try:
+            os.remove(os.path.join(output_dir, name))
+        except FileNotFoundError:
+            pass
+    index = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for name, lastmod in shards:
+        index.append(f"  <sitemap><loc>{BASE_URL}/sitemaps/{name}</loc><lastmod>{lastmod}</lastmod></sitemap>")
+    index.append("</sitemapindex>")
+    _write(os.path.join(output_dir, "sitemap.xml"), "\n".join(index) + "\n")
+    _write(state_path, json.dumps(new_state, indent=2) + "\n")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--max-urls", type=int, default=MAX_URLS)
+    parser.add_argument("--max-bytes", type=int, default=MAX_BYTES, help="uncompressed size limit per shard")
+    parser.add_argument("--posts-json", help="JSON export of blog_posts instead of Supabase")
+    parser.add_argument("--translations-json", help="JSON export of blog_post_translations instead of Supabase")
+    args = parser.parse_args()
+
+    posts = load_rows("blog_posts", args.posts_json, select="id,slug,status,created_at,updated_at",
+                      filters={"status": "eq.published"})
+    translations = load_rows("blog_post_translations", args.translations_json, select="post_id,locale,updated_at")
+    written = build(posts, translations, args.output_dir, args.max_urls, max_bytes=args.max_bytes)
+    for name in written:
+        print(f"OK: {name}")
+    print(f"Done: {len(written)} shard(s) rewritten")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Byte-size budgets for each locale catalog and each of its namespaces.
+
+By default the bundles the app serves are measured:
+src/i18n/compiled/<locale>.json, with en fallbacks filled in and, after
+`tools.key_usage --prune`, unused keys removed (run `python -m tools.icu`
+first). --source messages measures messages/*.json instead. For every
+catalog and every top-level namespace in it the raw (pretty-printed),
+minified, gzip and brotli sizes are computed. tools/size_budgets.json holds the limits per locale and
+namespace ("_total" for the whole catalog); `check` fails when any measured
+size exceeds its limit and prints the offenders ranked by overshoot, plus
+the biggest growers since the last entry in tools/size_history.jsonl.
+
+    python -m tools.size_budgets record      # (re)write budgets with headroom
+    python -m tools.size_budgets check
+    python -m tools.size_budgets check --append-history
+    python -m tools.size_budgets --source messages check
+
+brotli sizes are only measured when the brotli module is installed (see
+tools/requirements.txt).
+"""
+import argparse
+import datetime
+import gzip
+import json
+import math
+import os
+import subprocess
+import sys
+
+from tools.catalog import MESSAGES_DIR, REPO_ROOT, available_locales, load_catalog
+from tools.icu import COMPILED_DIR
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGETS_PATH = os.path.join(TOOLS_DIR, "size_budgets.json")
+HISTORY_PATH = os.path.join(TOOLS_DIR, "size_history.jsonl")
+TOTAL = "_total"
+ENFORCED = ("minified", "gzip", "brotli")
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def measure(value):
+    pretty = json.dumps(value, ensure_ascii=False, indent=2).encode("utf-8")
+    minified = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    sizes = {
+        "raw": len(pretty),
+        "minified": len(minified),
+        "gzip": len(gzip.compress(minified, 9, mtime=0)),
+    }
+    if brotli is not None:
+        sizes["brotli"] = len(brotli.compress(minified, quality=11))
+    return sizes
+
+
+def measure_all(messages_dir=MESSAGES_DIR, bundle_dir=None):
+    """{locale: {namespace|_total: {metric: bytes}}}.
+
+    With bundle_dir, each locale's compiled bundle there is measured instead
+    of its source catalog.
+    """
+    result = {}
+    for locale in available_locales(messages_dir):
+        data = load_catalog(locale, bundle_dir or messages_dir)
+        result[locale] = {namespace: measure(value) for namespace, value in data.items()}
+        result[locale][TOTAL] = measure(data)
+    return result
+
+
+def record_budgets(sizes, headroom, path=BUDGETS_PATH):
+    """Budget every enforced metric at the current size plus headroom, rounded up to 64 bytes."""
+    budgets = {
+        locale: {
+            namespace: {
+                metric: int(math.ceil(size * (1 + headroom) / 64) * 64)
+                for metric, size in metrics.items() if metric in ENFORCED
+            }
+            for namespace, metrics in namespaces.items()
+        }
+        for locale, namespaces in sizes.items()
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"headroom": headroom, "budgets": budgets}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def violations(sizes, budgets):
+    """[(excess, locale, namespace, metric, size, limit)] sorted by excess, largest first."""
+    found = []
+    for locale, namespaces in sizes.items():
+        for namespace, metrics in namespaces.items():
+            limits = budgets.get(locale, {}).get(namespace)
+            if limits is None:
+                found.append((metrics["minified"], locale, namespace, "unbudgeted", metrics["minified"], 0))
+                continue
+            for metric, limit in limits.items():
+                size = metrics.get(metric)
+                if size is not None and size > limit:
+                    found.append((size - limit, locale, namespace, metric, size, limit))
+    found.sort(reverse=True)
+    return found
+
+
+def last_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return None
+    last = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)
+    return last
+
+
+def growers(sizes, previous, limit=10):
+    """Biggest (delta, locale, namespace) gzip growths since a history entry."""
+    deltas = []
+    for locale, namespaces in sizes.items():
+        for namespace, metrics in namespaces.items():
+            before = previous.get(locale, {}).get(namespace)
+            if before is not None and metrics["gzip"] > before:
+                deltas.append((metrics["gzip"] - before, locale, namespace))
+    deltas.sort(reverse=True)
+    return deltas[:limit]
+
+
+def append_history(sizes, path=HISTORY_PATH, source="shipped"):
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                            capture_output=True, text=True).stdout.strip()
+    entry = {
+        "at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "source": source,
+        "gzip": {
+            locale: {namespace: metrics["gzip"] for namespace, metrics in namespaces.items()}
+            for locale, namespaces in sizes.items()
+        },
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, separators=(",", ":"), sort_keys=True) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages-dir", default=MESSAGES_DIR)
+    parser.add_argument("--budgets", default=BUDGETS_PATH)
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--source", choices=["shipped", "messages"], default="shipped",
+                        help="measure the compiled bundles (default) or messages/*.json")
+    parser.add_argument("--compiled-dir", default=COMPILED_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    record = sub.add_parser("record", help="write budgets from the current sizes")
+    record.add_argument("--headroom", type=float, default=0.10)
+    check = sub.add_parser("check", help="compare current sizes against the budgets")
+    check.add_argument("--append-history", action="store_true")
+    args = parser.parse_args()
+
+    bundle_dir = None
+    if args.source == "shipped":
+        bundle_dir = args.compiled_dir
+        if not os.path.exists(os.path.join(bundle_dir, "en.json")):
+            sys.exit(f"{bundle_dir} has no bundles; run `python -m tools.icu` first (or use --source messages)")
+    sizes = measure_all(args.messages_dir, bundle_dir)
+    if args.command == "record":
+        record_budgets(sizes, args.headroom, args.budgets)
+        print(f"Recorded budgets for {len(sizes)} locale(s) to {args.budgets}")
+        return
+
+    with open(args.budgets, "r", encoding="utf-8") as f:
+        budgets = json.load(f)["budgets"]
+    found = violations(sizes, budgets)
+    for excess, locale, namespace, metric, size, limit in found:
+        if metric == "unbudgeted":
+            print(f"OVER {locale}.{namespace}: no budget ({size} bytes minified)")
+        else:
+            print(f"OVER {locale}.{namespace} {metric}: {size} > {limit} (+{excess} bytes)")
+    previous = last_history(args.history)
+    # Entries from before --source existed measured messages/.
+    if previous and previous.get("source", "messages") == args.source:
+        grown = growers(sizes, previous["gzip"])
+        if grown:
+            print(f"Biggest gzip growers since {previous['commit'] or previous['at']}:")
+            for delta, locale, namespace in grown:
+                print(f"  +{delta:6} {locale}.{namespace}")
+    if args.append_history:
+        append_history(sizes, args.history, args.source)
+    print(f"{len(found)} budget violation(s)")
+    sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
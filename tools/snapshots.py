@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Content-addressed snapshots of the messages/ catalogs.
+
+Each catalog is stored as a Merkle tree: every dict node is serialized as an
+ordered list of [key, "s", string] / [key, "t", child_hash] entries and saved
+once under objects/ by the sha256 of that serialization. A snapshot is just
+{locale: root_hash}, so namespaces that are identical across snapshots or
+locales are stored once, and diffing two snapshots only descends into nodes
+whose hashes differ.
+
+    python -m tools.snapshots save --name before-guide-update
+    python -m tools.snapshots diff before-guide-update WORKING
+    python -m tools.snapshots restore before-guide-update --locale de --namespace guide
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import zlib
+
+from tools.atomic import CatalogTransaction
+from tools.catalog import MESSAGES_DIR, REPO_ROOT, available_locales, load_catalog
+
+STORE_DIR = os.path.join(REPO_ROOT, ".snapshots")
+WORKING = "WORKING"
+
+
+class SnapshotStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.refs_dir = os.path.join(root, "snapshots")
+        self._cache = {}
+
+    # -- objects ---------------------------------------------------------
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def put_tree(self, node):
+        """Store a dict node (and its children) and return its hash."""
+        entries = []
+        for key, value in node.items():
+            if isinstance(value, dict):
+                entries.append([key, "t", self.put_tree(value)])
+            else:
+                entries.append([key, "s", value])
+        raw = json.dumps(entries, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(zlib.compress(raw))
+            os.replace(tmp, path)
+        self._cache[digest] = entries
+        return digest
+
+    def get_entries(self, digest):
+        entries = self._cache.get(digest)
+        if entries is None:
+            with open(self._object_path(digest), "rb") as f:
+                entries = json.loads(zlib.decompress(f.read()))
+            self._cache[digest] = entries
+        return entries
+
+    def get_tree(self, digest):
+        """Rebuild the dict for a stored node."""
+        return {
+            key: self.get_tree(value) if kind == "t" else value
+            for key, kind, value in self.get_entries(digest)
+        }
+
+    # -- snapshots -------------------------------------------------------
+
+    def save(self, name=None, messages_dir=MESSAGES_DIR, locales=None):
+        roots = {
+            locale: self.put_tree(load_catalog(locale, messages_dir))
+            for locale in locales or available_locales(messages_dir)
+        }
+        now = datetime.datetime.now(datetime.timezone.utc)
+        name = name or now.strftime("%Y%m%dT%H%M%SZ")
+        os.makedirs(self.refs_dir, exist_ok=True)
+        with open(os.path.join(self.refs_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+            json.dump({"created_at": now.isoformat(), "locales": roots}, f, indent=2)
+            f.write("\n")
+        return name, roots
+
+    def roots(self, name, messages_dir=MESSAGES_DIR):
+        """{locale: root_hash} for a saved snapshot, or for the working tree."""
+        if name == WORKING:
+            return {
+                locale: self.put_tree(load_catalog(locale, messages_dir))
+                for locale in available_locales(messages_dir)
+            }
+        with open(os.path.join(self.refs_dir, f"{name}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)["locales"]
+
+    def list(self):
+        if not os.path.isdir(self.refs_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.refs_dir) if name.endswith(".json"))
+
+    def diff_trees(self, old, new, prefix=""):
+        """Yield (kind, dotted_path) for changes between two node hashes.
+
+        Only nodes whose hashes differ are loaded, so the cost is
+        proportional to the changed part of the tree.
+        """
+        if old == new:
+            return
+        old_entries = {key: (kind, value) for key, kind, value in self.get_entries(old)}
+        new_entries = {key: (kind, value) for key, kind, value in self.get_entries(new)}
+        for key, (kind, value) in old_entries.items():
+            path = f"{prefix}.{key}" if prefix else key
+            if key not in new_entries:
+                yield "removed", path
+                continue
+            new_kind, new_value = new_entries[key]
+            if kind == "t" and new_kind == "t":
+                yield from self.diff_trees(value, new_value, path)
+            elif (kind, value) != (new_kind, new_value):
+                yield "changed", path
+        for key in new_entries:
+            if key not in old_entries:
+                yield "added", f"{prefix}.{key}" if prefix else key
+
+    def diff(self, old_name, new_name, messages_dir=MESSAGES_DIR):
+        """Yield (locale, kind, dotted_path) between two snapshots."""
+        old_roots = self.roots(old_name, messages_dir)
+        new_roots = self.roots(new_name, messages_dir)
+        for locale in sorted(set(old_roots) | set(new_roots)):
+            if locale not in new_roots:
+                yield locale, "removed", ""
+            elif locale not in old_roots:
+                yield locale, "added", ""
+            else:
+                for kind, path in self.diff_trees(old_roots[locale], new_roots[locale]):
+                    yield locale, kind, path
+
+    def restore(self, name, messages_dir=MESSAGES_DIR, locales=None, namespace=None):
+        """Write a snapshot back to messages/, optionally only one namespace."""
+        roots = self.roots(name, messages_dir)
+        with CatalogTransaction(messages_dir) as txn:
+            for locale in locales or sorted(roots):
+                snapshot = self.get_tree(roots[locale])
+                if namespace is None:
+                    data = snapshot
+                else:
+                    data = txn.load(locale)
+                    if namespace in snapshot:
+                        data[namespace] = snapshot[namespace]
+                    else:
+                        data.pop(namespace, None)
+                txn.stage(locale, data)
+                print(f"OK: {locale}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--store", default=STORE_DIR)
+    parser.add_argument("--messages-dir", default=MESSAGES_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    save = sub.add_parser("save", help="snapshot the current catalogs")
+    save.add_argument("--name")
+    sub.add_parser("list", help="list saved snapshots")
+    diff = sub.add_parser("diff", help=f"changed paths between two snapshots ({WORKING} = current files)")
+    diff.add_argument("old")
+    diff.add_argument("new", nargs="?", default=WORKING)
+    restore = sub.add_parser("restore", help="write a snapshot back to messages/")
+    restore.add_argument("name")
+    restore.add_argument("--locale", action="append")
+    restore.add_argument("--namespace")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.store)
+    if args.command == "save":
+        name, roots = store.save(args.name, args.messages_dir)
+        print(f"Saved {name} ({len(roots)} locales)")
+    elif args.command == "list":
+        for name in store.list():
+            print(name)
+    elif args.command == "diff":
+        for locale, kind, path in store.diff(args.old, args.new, args.messages_dir):
+            print(f"{kind:8} {locale}: {path}")
+    elif args.command == "restore":
+        store.restore(args.name, args.messages_dir, args.locale, args.namespace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Minimal read-only PostgREST client for pulling rows out of Supabase.
+
+Uses the same NEXT_PUBLIC_SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY pair as
+src/lib/supabase/admin.ts. Only the standard library is required.
+"""
+import json
+import os
+import urllib.parse
+import urllib.request
+
+PAGE_SIZE = 1000
+
+BLOG_TRANSLATION_FIELDS = [
+    "title", "excerpt", "content", "image_alt",
+    "meta_title", "meta_description", "og_title", "og_description",
+]
+
+
+def _config():
+    url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        raise RuntimeError("Missing NEXT_PUBLIC_SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY environment variable")
+    return url.rstrip("/"), key
+
+
+def fetch_rows(table, select="*", filters=None, order=None):
+    """Yield every row of `table`, paging through PostgREST with Range headers."""
+    url, key = _config()
+    params = {"select": select}
+    params.update(filters or {})
+    if order:
+        params["order"] = order
+    endpoint = f"{url}/rest/v1/{table}?{urllib.parse.urlencode(params)}"
+    start = 0
+    while True:
+        request = urllib.request.Request(endpoint, headers={
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Range-Unit": "items",
+            "Range": f"{start}-{start + PAGE_SIZE - 1}",
+        })
+        with urllib.request.urlopen(request) as response:
+            rows = json.load(response)
+        yield from rows
+        if len(rows) < PAGE_SIZE:
+            return
+        start += PAGE_SIZE
+
+
+def load_rows(table, export_path=None, **kwargs):
+    """Rows from a JSON export (a list of row objects) or, without one, from Supabase."""
+    if export_path:
+        with open(export_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return list(fetch_rows(table, **kwargs))
+
+
+def load_blog_translations(export_path=None):
+    return load_rows(
+        "blog_post_translations",
+        export_path,
+        select="post_id,locale," + ",".join(BLOG_TRANSLATION_FIELDS),
+        order="post_id,locale",
+    )
@@ -0,0 +1,179 @@
+"""Run metrics (Prometheus textfile format) and nested trace spans (JSON lines).
+
+    from tools import telemetry
+
+    with telemetry.run("apply_translations"):
+        for lang in langs:
+            with telemetry.span("apply", locale=lang):
+                ...
+                telemetry.inc("keys_changed_total", len(ops), locale=lang)
+
+run() opens the root span. When it exits, every counter collected during
+the run is written to <metrics dir>/<job>.prom, together with stage
+durations per span name and locale, the catalog cache hit ratio, the run
+duration, success and timestamp. The file is replaced atomically, which is
+what node_exporter's textfile collector expects. Each finished span is
+appended to the trace file as one JSON object per line with trace_id,
+span_id, parent_id, name, start, duration_ms, status and attrs.
+
+Both outputs are plain local files; no collector needs to be running.
+They default to .cache/tools/metrics/ and .cache/tools/traces.jsonl.
+DOPPLER_TOOLS_METRICS_DIR and DOPPLER_TOOLS_TRACE_FILE override the paths,
+and DOPPLER_TOOLS_TELEMETRY=0 turns both off.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from tools.catalog import CACHE_DIR
+
+PREFIX = "doppler_i18n_"
+METRICS = {
+    "bytes_read_total": ("counter", "Catalog bytes read."),
+    "bytes_written_total": ("counter", "Catalog bytes written."),
+    "keys_changed_total": ("counter", "Message keys added, removed or replaced."),
+    "stage_duration_seconds": ("gauge", "Wall time spent in each stage of the last run."),
+    "cache_requests_total": ("counter", "Parsed-catalog cache lookups by result."),
+    "cache_hit_ratio": ("gauge", "Share of parsed-catalog cache lookups served without parsing."),
+    "run_duration_seconds": ("gauge", "Wall time of the last run."),
+    "run_success": ("gauge", "1 if the last run finished without an exception."),
+    "run_last_timestamp_seconds": ("gauge", "Unix time the last run finished."),
+}
+
+_values = {}   # (name, sorted label items) -> value
+_stack = []    # open spans
+_trace_id = None
+
+
+def enabled():
+    return os.environ.get("DOPPLER_TOOLS_TELEMETRY", "1") != "0"
+
+
+def metrics_dir():
+    return os.environ.get("DOPPLER_TOOLS_METRICS_DIR") or os.path.join(CACHE_DIR, "metrics")
+
+
+def trace_file():
+    return os.environ.get("DOPPLER_TOOLS_TRACE_FILE") or os.path.join(CACHE_DIR, "traces.jsonl")
+
+
+def inc(name, amount=1, **labels):
+    """Add amount to a counter (or accumulate a gauge) for the current run."""
+    key = (name, tuple(sorted(labels.items())))
+    _values[key] = _values.get(key, 0) + amount
+
+
+def set_value(name, value, **labels):
+    _values[(name, tuple(sorted(labels.items())))] = value
+
+
+def _new_id():
+    return os.urandom(8).hex()
+
+
+def _append_trace(record):
+    path = trace_file()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time a block; nested spans record their parent."""
+    if not enabled() or _trace_id is None:
+        yield
+        return
+    record = {
+        "trace_id": _trace_id,
+        "span_id": _new_id(),
+        "parent_id": _stack[-1]["span_id"] if _stack else None,
+        "name": name,
+        "start": time.time(),
+        "attrs": attrs,
+    }
+    _stack.append(record)
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield record
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        _stack.pop()
+        record["duration_ms"] = round(elapsed * 1000, 3)
+        record["status"] = status
+        _append_trace(record)
+        labels = {"stage": name}
+        if "locale" in attrs:
+            labels["locale"] = attrs["locale"]
+        inc("stage_duration_seconds", elapsed, **labels)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render(job):
+    """The collected values in Prometheus text exposition format."""
+    lines = []
+    by_name = {}
+    for (name, labels), value in _values.items():
+        by_name.setdefault(name, []).append((labels, value))
+    for name, (kind, help_text) in METRICS.items():
+        if name not in by_name:
+            continue
+        lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+        for labels, value in sorted(by_name[name], key=lambda item: item[0]):
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in (("job", job),) + labels)
+            lines.append(f"{PREFIX}{name}{{{label_text}}} {value:g}" if isinstance(value, float)
+                         else f"{PREFIX}{name}{{{label_text}}} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_metrics(job):
+    directory = metrics_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{job}.prom")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render(job))
+    os.replace(tmp, path)
+    return path
+
+
+@contextmanager
+def run(job, **attrs):
+    """Root span for one job run; writes the metrics file when it ends."""
+    global _trace_id
+    if not enabled() or _trace_id is not None:
+        with span(job, **attrs):
+            yield
+        return
+    from tools import catalog_cache
+
+    _values.clear()
+    hits, misses = catalog_cache.STATS["hits"], catalog_cache.STATS["misses"]
+    _trace_id = _new_id()
+    started = time.perf_counter()
+    success = 0
+    try:
+        with span(job, **attrs):
+            yield
+        success = 1
+    finally:
+        _trace_id = None
+        hits = catalog_cache.STATS["hits"] - hits
+        misses = catalog_cache.STATS["misses"] - misses
+        inc("cache_requests_total", hits, result="hit")
+        inc("cache_requests_total", misses, result="miss")
+        if hits + misses:
+            set_value("cache_hit_ratio", round(hits / (hits + misses), 4))
+        set_value("run_duration_seconds", round(time.perf_counter() - started, 6))
+        set_value("run_success", success)
+        set_value("run_last_timestamp_seconds", int(time.time()))
+        _write_metrics(job)
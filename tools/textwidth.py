@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Flag translations that render much wider than their en source.
+
+Widths are estimated from the advance widths of the bundled FK Raster Roman
+Compact font (see tools/fontinfo.py), in ems. Characters the font lacks fall
+back to the font's average advance, East Asian wide characters count as one
+em and combining marks as zero. Budgets live in tools/width_budgets.json:
+"keys" maps fnmatch patterns to the allowed width ratio against en; every
+other key shorter than "paragraph_em" on en uses the default "ratio".
+A key is only flagged when it is also more than "slack_em" wider than en,
+so one-word labels don't trip on a single extra letter.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import unicodedata
+
+from tools.catalog import DEFAULT_LOCALE, MESSAGES_DIR, available_locales, load_flat_catalog
+from tools.fontinfo import DEFAULT_FONT, load_metrics
+
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "width_budgets.json")
+
+
+class WidthTable(dict):
+    """Character -> width in ems, filled lazily from the font metrics."""
+
+    def __init__(self, metrics):
+        super().__init__()
+        self.metrics = metrics
+        self.fallback = metrics.avg_advance / metrics.units_per_em
+
+    def __missing__(self, ch):
+        advance = self.metrics.advances.get(ord(ch))
+        if advance is not None:
+            width = advance / self.metrics.units_per_em
+        elif unicodedata.category(ch) in ("Mn", "Me", "Cf"):
+            width = 0.0
+        elif unicodedata.east_asian_width(ch) in ("W", "F"):
+            width = 1.0
+        else:
+            width = self.fallback
+        self[ch] = width
+        return width
+
+
+def measure_all(catalogs, table):
+    """{locale: {key: width_em}} for every string of every catalog."""
+    lookup = table.__getitem__
+    return {
+        locale: {key: sum(map(lookup, text)) for key, text in flat.items()}
+        for locale, flat in catalogs.items()
+    }
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def budget_for(key, en_width, budgets):
+    """Allowed ratio for key, or None when the key is body text and may wrap."""
+    for pattern, ratio in budgets.get("keys", {}).items():
+        if fnmatch.fnmatchcase(key, pattern):
+            return ratio
+    if en_width <= budgets.get("paragraph_em", float("inf")):
+        return budgets["ratio"]
+    return None
+
+
+def find_overflows(widths, budgets):
+    """Yield overflow findings, widest-relative first within each locale."""
+    source = widths[DEFAULT_LOCALE]
+    slack = budgets.get("slack_em", 0.0)
+    for locale, measured in widths.items():
+        if locale == DEFAULT_LOCALE:
+            continue
+        findings = []
+        for key, width in measured.items():
+            en_width = source.get(key)
+            if not en_width:
+                continue
+            ratio = budget_for(key, en_width, budgets)
+            if ratio is None:
+                continue
+            if width > en_width * ratio and width - en_width > slack:
+                findings.append({"locale": locale, "key": key, "en_em": round(en_width, 2),
+                                 "em": round(width, 2), "ratio": round(width / en_width, 2),
+                                 "budget": ratio})
+        findings.sort(key=lambda finding: finding["ratio"], reverse=True)
+        yield from findings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages-dir", default=MESSAGES_DIR)
+    parser.add_argument("--font", default=DEFAULT_FONT)
+    parser.add_argument("--budgets", default=BUDGETS_PATH)
+    parser.add_argument("--locale", action="append", help="limit to these locales (repeatable)")
+    parser.add_argument("--json", action="store_true", help="print findings as JSON lines")
+    args = parser.parse_args()
+
+    locales = args.locale or available_locales(args.messages_dir)
+    if DEFAULT_LOCALE not in locales:
+        locales = [DEFAULT_LOCALE] + locales
+    catalogs = {locale: load_flat_catalog(locale, args.messages_dir) for locale in locales}
+    widths = measure_all(catalogs, WidthTable(load_metrics(args.font)))
+    findings = list(find_overflows(widths, load_budgets(args.budgets)))
+
+    for finding in findings:
+        if args.json:
+            print(json.dumps(finding, ensure_ascii=False))
+        else:
+            print(f"{finding['locale']}: {finding['key']}: {finding['em']}em vs en {finding['en_em']}em "
+                  f"(x{finding['ratio']}, budget x{finding['budget']})")
+    if not args.json:
+        print(f"{len(findings)} key(s) over width budget")
+    sys.exit(1 if findings else 0)
+
+
+if __name__ == "__main__":
+    main()
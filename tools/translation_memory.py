@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Fuzzy translation-memory suggestions from a trigram index over the catalogs.
+
+Every en message is a translation unit; its translations are the strings
+other locales hold under the same key. Units are indexed by character
+trigrams of their normalized en text (lowercased, whitespace collapsed),
+and a query is scored against candidates sharing at least one trigram with
+the Dice coefficient 2|A∩B| / (|A|+|B|).
+
+The index is pickled in .cache/tools/translation_memory.pickle together
+with each catalog's sha256. On the next run only catalogs whose digest
+changed are re-read: en changes add and remove units in the index, other
+locales just replace their translations.
+
+    python -m tools.translation_memory suggest "Open our Telegram bot" --locale de
+    python -m tools.translation_memory suggest "Tap Import from clipboard" -k 3 --json
+    python -m tools.translation_memory stats
+"""
+import argparse
+import json
+import os
+import pickle
+import re
+import sys
+import time
+from collections import Counter
+
+from tools.catalog import (
+    DEFAULT_LOCALE, MESSAGES_DIR, available_locales, cache_path, catalog_path, file_digest, load_flat_catalog,
+)
+
+CACHE_FILE = "translation_memory.pickle"
+FORMAT_VERSION = 1
+
+
+def normalize(text):
+    return re.sub(r"\s+", " ", text.strip().lower())
+
+
+def trigrams(text):
+    padded = f"  {normalize(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted trigram index over en unit texts, updated in place."""
+
+    def __init__(self):
+        self.units = {}       # en text -> {"keys": set, "grams": int}
+        self.postings = {}    # trigram -> set of en texts
+
+    def add(self, text, key):
+        unit = self.units.get(text)
+        if unit is None:
+            grams = trigrams(text)
+            unit = self.units[text] = {"keys": set(), "grams": len(grams)}
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(text)
+        unit["keys"].add(key)
+
+    def discard(self, text, key):
+        unit = self.units.get(text)
+        if unit is None:
+            return
+        unit["keys"].discard(key)
+        if unit["keys"]:
+            return
+        del self.units[text]
+        for gram in trigrams(text):
+            texts = self.postings.get(gram)
+            if texts is not None:
+                texts.discard(text)
+                if not texts:
+                    del self.postings[gram]
+
+    def query(self, text, k=5, min_score=0.4):
+        """[(score, en text)] best first."""
+        grams = trigrams(text)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        scored = []
+        for candidate, common in shared.items():
+            score = 2 * common / (len(grams) + self.units[candidate]["grams"])
+            if score >= min_score:
+                scored.append((round(score, 3), candidate))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return scored[:k]
+
+
+class TranslationMemory:
+    def __init__(self):
+        self.index = TrigramIndex()
+        self.source = {}        # en key -> en text
+        self.translations = {}  # locale -> {key: text}
+        self.digests = {}       # locale -> catalog sha256
+
+    def refresh(self, messages_dir=MESSAGES_DIR):
+        """Re-read changed catalogs; return the locales that were reloaded."""
+        changed = []
+        locales = available_locales(messages_dir)
+        for locale in set(self.digests) - set(locales):
+            del self.digests[locale]
+            self.translations.pop(locale, None)
+        for locale in locales:
+            digest = file_digest(catalog_path(locale, messages_dir))
+            if self.digests.get(locale) == digest:
+                continue
+            flat = load_flat_catalog(locale, messages_dir)
+            if locale == DEFAULT_LOCALE:
+                self._update_source(flat)
+            else:
+                self.translations[locale] = flat
+            self.digests[locale] = digest
+            changed.append(locale)
+        return changed
+
+    def _update_source(self, flat):
+        for key, text in self.source.items():
+            if flat.get(key) != text:
+                self.index.discard(text, key)
+        for key, text in flat.items():
+            if self.source.get(key) != text:
+                self.index.add(text, key)
+        self.source = dict(flat)
+
+    def suggest(self, text, locales=None, k=5, min_score=0.4):
+        """Top-k similar en units with their translations in the requested locales."""
+        suggestions = []
+        for score, source in self.index.query(text, k, min_score):
+            keys = sorted(self.index.units[source]["keys"])
+            translations = {}
+            for locale in locales or sorted(self.translations):
+                texts = Counter(
+                    self.translations[locale][key] for key in keys if key in self.translations.get(locale, {})
+                )
+                if texts:
+                    translations[locale] = [t for t, _ in texts.most_common()]
+            suggestions.append({"score": score, "source": source, "keys": keys, "translations": translations})
+        return suggestions
+
+
+def load_memory(messages_dir=MESSAGES_DIR):
+    """Load the cached memory and bring it up to date with the catalogs."""
+    path = cache_path(CACHE_FILE)
+    memory = TranslationMemory()
+    # Only plain containers are pickled, so the cache loads the same whether
+    # the module runs as __main__ or is imported.
+    try:
+        with open(path, "rb") as f:
+            version, state = pickle.load(f)
+        if version == FORMAT_VERSION:
+            memory.source, memory.translations, memory.digests, memory.index.units, memory.index.postings = state
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        pass
+    if memory.refresh(messages_dir):
+        state = (memory.source, memory.translations, memory.digests, memory.index.units, memory.index.postings)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((FORMAT_VERSION, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    return memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    suggest_parser = sub.add_parser("suggest", help="near matches for an en string")
+    suggest_parser.add_argument("text")
+    suggest_parser.add_argument("--locale", action="append", help="only show these locales (repeatable)")
+    suggest_parser.add_argument("-k", type=int, default=5)
+    suggest_parser.add_argument("--min-score", type=float, default=0.4)
+    suggest_parser.add_argument("--json", action="store_true")
+    sub.add_parser("stats", help="index size")
+    args = parser.parse_args()
+
+    memory = load_memory()
+    if args.command == "stats":
+        print(f"{len(memory.index.units)} units, {len(memory.index.postings)} trigrams, "
+              f"{len(memory.translations)} target locales")
+        return
+    started = time.perf_counter()
+    suggestions = memory.suggest(args.text, args.locale, args.k, args.min_score)
+    elapsed = (time.perf_counter() - started) * 1000
+    if args.json:
+        json.dump(suggestions, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+    for suggestion in suggestions:
+        print(f"{suggestion['score']:.3f}  {suggestion['source']}  ({', '.join(suggestion['keys'])})")
+        for locale, texts in suggestion["translations"].items():
+            for text in texts:
+                print(f"       {locale}: {text}")
+    print(f"{len(suggestions)} suggestion(s) in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()